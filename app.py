@@ -1,9 +1,14 @@
 from medjobhub import app,db
+from flask_migrate import upgrade
 from medjobhub.models import User
+from medjobhub.services import ensure_job_search_index, mail_outbox
 if __name__ == '__main__':
     with app.app_context():
         # db.drop_all()
         db.create_all()
+        upgrade()
+        ensure_job_search_index()
+        mail_outbox.start()
         
         users = User.query.all()
         for user in users:
@@ -21,16 +21,43 @@ from config import Config
 from flask_restful import fields, marshal
 from dotenv import load_dotenv
 from flask_session import Session
+from flask_migrate import Migrate
+from sqlalchemy import event
 
 load_dotenv()
 
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# Database URL and engine/pool options come from the environment (see Config)
+app.config.from_object(Config)
 db = SQLAlchemy()
 
 db.init_app(app)
 
+
+#SQLite tuning for every new connection: WAL lets readers run alongside the single writer,
+#busy_timeout makes a blocked writer wait instead of failing with "database is locked"
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}")
+    cursor.execute(f"PRAGMA cache_size=-{int(app.config['SQLITE_CACHE_SIZE_KB'])}")
+    cursor.execute(f"PRAGMA mmap_size={int(app.config['SQLITE_MMAP_SIZE'])}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+with app.app_context():
+    if db.engine.dialect.name == 'sqlite':
+        event.listen(db.engine, "connect", set_sqlite_pragmas)
+
+
+#Tables managed outside the models (the FTS5 search index and its shadow tables)
+def include_in_migrations(name, type_, parent_names):
+    return not (type_ == "table" and name.startswith("jobs_fts"))
+
+migrate = Migrate(app, db, directory=os.path.join(os.path.dirname(app.root_path), 'migrations'),
+                  render_as_batch=True, include_name=include_in_migrations)
+
 #http://medjobhub.com
 allowed_url="https://medjobhub.vercel.app"
 
@@ -42,46 +69,49 @@ CORS(app,
      allow_headers=["Content-Type", "Authorization"]
      )
 
-app.config.from_object(Config) 
-
 
 login_manager=LoginManager(app)
 login_manager.login_view='signin'
 login_manager.login_message_category='sucess'
-otp_storage = {}
 
 upload_folder = os.path.join(os.getcwd(), 'uploads')
 if not os.path.exists(upload_folder):
     os.makedirs(upload_folder)
 
-app.config['SESSION_TYPE'] = 'filesystem'
 app.config['SESSION_COOKIE_SAMESITE'] = 'None'
 app.config['SESSION_COOKIE_SECURE'] = True 
 app.config['SESSION_PERMANENT'] = False
 app.config['SESSION_USE_SIGNER'] = True
 app.config['SECRET_KEY'] = os.getenv("SECRET_KEY", "supersecret")
 
-Session(app)
-
-
-
 app.config["SESSION_PERMANENT"] = False
-app.config["SESSION_TYPE"] = "filesystem"
 app.config['UPLOAD_FOLDER'] = upload_folder  
 app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'doc', 'docx', 'jpg', 'png'}
 
 # Flask-Mail Configuration
-app.config['MAIL_SERVER'] = 'smtp.gmail.com'
-app.config['MAIL_PORT'] = 465
+app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
+app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 465))
 app.config['MAIL_USERNAME'] = os.getenv('EMAIL_ID')
 app.config['MAIL_PASSWORD'] = os.getenv('EMAIL_APP_PASSWORD')
-app.config['MAIL_USE_TLS'] = False
-app.config['MAIL_USE_SSL'] = True
+app.config['MAIL_USE_TLS'] = os.getenv('MAIL_USE_TLS', 'false').lower() == 'true'
+app.config['MAIL_USE_SSL'] = os.getenv('MAIL_USE_SSL', 'true').lower() == 'true'
 
 
 def allowed_file(filename):
     allowed_extensions = {'pdf', 'doc', 'docx', 'jpg', 'png'}
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions
 
+
+#Response projection from ?view=card or ?fields=a,b,c; None means every field
+def requested_fields(model):
+    if request.args.get('view') == 'card':
+        return model.CARD_FIELDS
+    fields = [field.strip() for field in request.args.get('fields', '').split(',')]
+    return tuple(field for field in fields if field in model.FIELDS) or None
+
 from medjobhub.models import User, Job, UserProfile,JobApplication
-from medjobhub.routes import signin,signup,verify_otp,logout,job_cards,application_cards,contact_us,profile,ai_sorting,chatbot
\ No newline at end of file
+from medjobhub.services.session_store import init_session_store
+init_session_store(app)
+from medjobhub.services.job_search import init_job_search_index
+init_job_search_index(app)
+from medjobhub.routes import signin,signup,verify_otp,logout,job_cards,application_cards,contact_us,profile,ai_sorting,chatbot,messages
\ No newline at end of file
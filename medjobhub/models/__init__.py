@@ -3,3 +3,8 @@ from .job_application import JobApplication
 from .user import User
 from .user_profile import UserProfile
 from .chat_message import ChatMessage
+from .server_session import ServerSession
+from .outbox_message import OutboxMessage
+from .job_match_score import JobMatchScore
+from .otp_code import OtpCode
+from .rate_limit_bucket import RateLimitBucket
@@ -7,3 +7,18 @@ class ChatMessage(db.Model):
     message = db.Column(db.Text, nullable=False)
     room = db.Column(db.String(100), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Room history is read newest first, paged by (timestamp, id)
+    __table_args__ = (
+        db.Index('ix_chat_message_room_timestamp', 'room', 'timestamp'),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "room": self.room,
+            "sender_id": self.sender_id,
+            "receiver_id": self.receiver_id,
+            "message": self.message,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None
+        }
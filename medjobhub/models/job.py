@@ -1,4 +1,5 @@
 from medjobhub import db,datetime
+from sqlalchemy.orm import joinedload, load_only
 
 
 class Job(db.Model):
@@ -9,7 +10,7 @@ class Job(db.Model):
     location = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=False)
     salary = db.Column(db.Float, nullable=False)
-    posted_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  
+    posted_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)  
     posted_on = db.Column(db.DateTime, default=datetime.utcnow)
 
     employment_type = db.Column(db.String(50), nullable=False, default="Full-time")  
@@ -27,28 +28,46 @@ class Job(db.Model):
 
     applications = db.relationship('JobApplication', back_populates='job', lazy=True)
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "company": self.company,
-            "location": self.location,
-            "salary": self.salary,
-            "posted_on": self.posted_on.isoformat() if self.posted_on else None,
-            "description": self.description,
-            "employment_type": self.employment_type,
-            "specialization": self.specialization,
-            "required_experience": self.required_experience,
-            "required_qualifications": self.required_qualifications,
-            "shift_timing": self.shift_timing,
-            "job_type": self.job_type,
-            "application_deadline": self.application_deadline.isoformat() if self.application_deadline else None,
-            "benefits": self.benefits,
-            "contact_email": self.contact_email,
-            "contact_phone": self.contact_phone,
-            "posted_by": self.posted_by,  
-            "employer": {
+    # Composite (filter column, id) indexes so a filtered /available_jobs page is a
+    # single index range scan in id order.
+    __table_args__ = (
+        db.Index('ix_jobs_location_id', 'location', 'id'),
+        db.Index('ix_jobs_specialization_id', 'specialization', 'id'),
+        db.Index('ix_jobs_employment_type_id', 'employment_type', 'id'),
+        db.Index('ix_jobs_job_type_id', 'job_type', 'id'),
+        db.Index('ix_jobs_salary_id', 'salary', 'id'),
+    )
+
+    # Serializable fields in response order; CARD_FIELDS is the compact projection
+    # used by list views (?view=card).
+    FIELDS = (
+        "id", "title", "company", "location", "salary", "posted_on", "description",
+        "employment_type", "specialization", "required_experience", "required_qualifications",
+        "shift_timing", "job_type", "application_deadline", "benefits", "contact_email",
+        "contact_phone", "posted_by", "employer",
+    )
+    CARD_FIELDS = ("id", "title", "company", "location", "salary", "employment_type", "posted_on")
+
+    # Loader options for to_dict(fields): only the requested columns are selected and
+    # the employer is joined in the same query instead of one extra query per job.
+    @classmethod
+    def to_dict_options(cls, fields=None):
+        from .user import User
+        fields = fields or cls.FIELDS
+        columns = [getattr(cls, field) for field in fields if field in cls.__table__.columns] or [cls.id]
+        options = [load_only(*columns)]
+        if "employer" in fields:
+            options.append(joinedload(cls.employer).load_only(User.id, User.username))
+        return options
+
+    def to_dict(self, fields=None):
+        return {field: self._field_value(field) for field in fields or self.FIELDS}
+
+    def _field_value(self, field):
+        if field == "employer":
+            return {
                 "id": self.employer.id,
                 "username": self.employer.username
-            } if self.employer else None,  
-        }
\ No newline at end of file
+            } if self.employer else None
+        value = getattr(self, field)
+        return value.isoformat() if isinstance(value, datetime) else value
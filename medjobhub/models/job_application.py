@@ -1,11 +1,12 @@
 from medjobhub import db,datetime
+from sqlalchemy.orm import joinedload, load_only
 
 
 class JobApplication(db.Model):
     __tablename__ = 'job_applications'
     id = db.Column(db.Integer, primary_key=True)
-    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)  
     applicant_name = db.Column(db.String(255), nullable=False)
     email = db.Column(db.String(255), nullable=False)
     phone = db.Column(db.String(20), nullable=False)
@@ -17,33 +18,54 @@ class JobApplication(db.Model):
     experience = db.Column(db.String(50), nullable=True)
     preferred_shift = db.Column(db.String(100), nullable=True)
     expected_salary = db.Column(db.Float, nullable=True)
-    application_status = db.Column(db.String(50), nullable=False, default="Pending")  
+    application_status = db.Column(db.String(50), nullable=False, default="Pending", index=True)  
 
     job = db.relationship('Job', back_populates='applications', lazy=True)
     applicant = db.relationship('User', back_populates='applications', lazy=True)
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "job_id": self.job_id,
-            "user_id": self.user_id,
-            "applicant_name": self.applicant_name,
-            "email": self.email,
-            "phone": self.phone,
-            "resume_link": self.resume_link,
-            "cover_letter": self.cover_letter,
-            "applied_on": self.applied_on.isoformat() if self.applied_on else None,
-            "qualifications": self.qualifications,
-            "experience": self.experience,
-            "preferred_shift": self.preferred_shift,
-            "expected_salary": self.expected_salary,
-            "application_status": self.application_status,
-            
-            "job": self.job.to_dict() if self.job else None,
-    
-            "applicant": {
+    # Serializable fields in response order; CARD_FIELDS is the compact projection
+    # used by list views (?view=card).
+    FIELDS = (
+        "id", "job_id", "user_id", "applicant_name", "email", "phone", "resume_link",
+        "cover_letter", "applied_on", "qualifications", "experience", "preferred_shift",
+        "expected_salary", "application_status", "job", "applicant",
+    )
+    CARD_FIELDS = ("id", "job_id", "applicant_name", "applied_on", "expected_salary", "application_status", "job")
+
+    # A projected application nests the compact job card instead of the full job.
+    @classmethod
+    def job_fields_for(cls, fields):
+        from .job import Job
+        return Job.CARD_FIELDS if fields else Job.FIELDS
+
+    # Loader options for to_dict(fields): requested columns only, with the job (and its
+    # employer) and the applicant joined into the same query.
+    @classmethod
+    def to_dict_options(cls, fields=None):
+        from .job import Job
+        from .user import User
+        job_fields = cls.job_fields_for(fields)
+        fields = fields or cls.FIELDS
+        columns = [getattr(cls, field) for field in fields if field in cls.__table__.columns] or [cls.id]
+        options = [load_only(*columns)]
+        if "job" in fields:
+            options.append(joinedload(cls.job).options(*Job.to_dict_options(job_fields)))
+        if "applicant" in fields:
+            options.append(joinedload(cls.applicant).load_only(User.id, User.username, User.email))
+        return options
+
+    def to_dict(self, fields=None):
+        job_fields = self.job_fields_for(fields)
+        return {field: self._field_value(field, job_fields) for field in fields or self.FIELDS}
+
+    def _field_value(self, field, job_fields):
+        if field == "job":
+            return self.job.to_dict(job_fields) if self.job else None
+        if field == "applicant":
+            return {
                 "id": self.applicant.id,
                 "username": self.applicant.username,
                 "email": self.applicant.email
             } if self.applicant else None
-        }
\ No newline at end of file
+        value = getattr(self, field)
+        return value.isoformat() if isinstance(value, datetime) else value
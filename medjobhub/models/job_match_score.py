@@ -0,0 +1,19 @@
+from medjobhub import db,datetime
+
+
+class JobMatchScore(db.Model):
+    __tablename__ = 'job_match_scores'
+    id = db.Column(db.Integer, primary_key=True)
+    profile_fp = db.Column(db.String(64), nullable=False)
+    job_id = db.Column(db.Integer, nullable=False)
+    job_fp = db.Column(db.String(64), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
+    match_score = db.Column(db.Integer, nullable=False)
+    reason = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    # One score per (profile version, job version)
+    __table_args__ = (
+        db.Index('ix_job_match_scores_profile_job', 'profile_fp', 'job_id', 'job_fp', unique=True),
+    )
@@ -0,0 +1,10 @@
+from medjobhub import db
+
+
+class OtpCode(db.Model):
+    __tablename__ = 'otp_codes'
+    username = db.Column(db.String(80), primary_key=True)
+    code = db.Column(db.String(6), nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,8 @@
+from medjobhub import db
+
+
+class RateLimitBucket(db.Model):
+    __tablename__ = 'rate_limit_buckets'
+    key = db.Column(db.String(255), primary_key=True)  # "<limit name>:<user or ip>"
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False, index=True)  # unix time of the last refill
@@ -0,0 +1,8 @@
+from medjobhub import db
+
+
+class ServerSession(db.Model):
+    __tablename__ = 'server_sessions'
+    sid = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.Text, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
@@ -1,21 +1,99 @@
 from flask import request, jsonify
 from medjobhub import app, session, cross_origin
+from medjobhub.models import Job
+from medjobhub.routes.job_cards import job_filters
+from medjobhub.routes.profile import profile_dict
+from medjobhub.services import rank_jobs, match_reason, ranking_cache, profile_fingerprint, current_user, current_profile, signin_required, sharded_ranker, job_vectors
+from werkzeug.datastructures import MultiDict
 import os, json
 import google.generativeai as genai
 
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
-@app.route("/ai-job-matcher", methods=["POST", "OPTIONS"])
-@cross_origin(origins=["http://localhost:5173"], supports_credentials=True, 
-              allow_headers=["Content-Type", "Authorization"])
-def ai_job_matcher():
-    data = request.json
-    profile = data.get("profile")
-    jobs = data.get("jobs")
 
-    if not profile or not jobs:
-        return jsonify({"error": "Missing data"}), 400
+#Local BM25 ranking in the same shape as Gemini's ranked_jobs
+def local_ranking(ranking, jobs):
+    return [
+        {"id": jobs[i].get("id"), "match_score": score, "reason": match_reason(terms)}
+        for i, score, terms in ranking
+    ]
+
+
+#Local scores are relative to the best local match; rescale the ones standing in for missing
+#model scores by how the model scored the jobs both rankers saw, so the lists merge sensibly
+def calibrated_fallback(local_entries, model_entries, job_ids):
+    local_scores = {entry["id"]: entry["match_score"] for entry in local_entries}
+    pairs = [(local_scores[entry["id"]], entry["match_score"]) for entry in model_entries if entry["id"] in local_scores]
+    local_total = sum(local for local, _ in pairs)
+    factor = sum(model for _, model in pairs) / local_total if local_total else 1.0
+    return [
+        dict(entry, match_score=min(100, int(round(entry["match_score"] * factor))))
+        for entry in local_entries if entry["id"] in job_ids
+    ]
+
+
+def sort_by_score(ranked_jobs):
+    return sorted(ranked_jobs, key=lambda j: j.get("match_score", 0), reverse=True)
+
+
+#Job columns the matcher ranks on; the prompt gets a shortened description
+MATCHER_JOB_FIELDS = (
+    "id", "title", "company", "location", "salary", "employment_type", "job_type", "specialization",
+    "required_experience", "required_qualifications", "shift_timing", "description",
+)
+PROMPT_DESCRIPTION_CHARS = 500
+
+
+#Candidate jobs from the database: the listing filters (?location=... or {"filters": {...}})
+#and/or explicit {"job_ids": [...]}, newest first, capped at AI_MATCHER_MAX_JOBS. Body filters
+#take precedence over query args of the same name. Without explicit ids, the job vector index
+#first narrows the filtered jobs to the AI_MATCHER_PREFILTER postings nearest the profile.
+def load_candidate_jobs(data, profile):
+    filters = request.args.to_dict()
+    filters.update({field: str(value) for field, value in (data.get("filters") or {}).items()})
+    filters = MultiDict(filters)
+    conditions = job_filters(filters)
+    query = Job.query.options(*Job.to_dict_options(MATCHER_JOB_FIELDS)).filter(*conditions)
+    job_ids = data.get("job_ids")
+    if job_ids:
+        query = query.filter(Job.id.in_([int(job_id) for job_id in job_ids]))
+    else:
+        among = [job_id for job_id, in Job.query.with_entities(Job.id).filter(*conditions)] if conditions else None
+        nearest = prefiltered_job_ids(profile, among)
+        if nearest is not None:
+            query = query.filter(Job.id.in_(nearest))
+    jobs = query.order_by(Job.id.desc()).limit(app.config['AI_MATCHER_MAX_JOBS']).all()
+    return [job.to_dict(MATCHER_JOB_FIELDS) for job in jobs]
+
+
+#Nearest job ids to the profile, ranked only among `among` (the filtered ids) when given.
+#None (no narrowing) when the candidate set already fits in AI_MATCHER_PREFILTER.
+def prefiltered_job_ids(profile, among=None):
+    limit = app.config['AI_MATCHER_PREFILTER']
+    if limit <= 0:
+        return None
+    candidates = len(among) if among is not None else Job.query.count()
+    if candidates <= limit:
+        return None
+    try:
+        vector = job_vectors.profile_vector(profile)
+        if not vector.any():
+            return None
+        return [job_id for job_id, _ in job_vectors.top_k(vector, limit, among=among)]
+    except Exception:
+        app.logger.exception("Job vector pre-filter failed; ranking all loaded jobs")
+        return None
+
+
+def prompt_job(job):
+    description = job.get("description") or ""
+    if len(description) > PROMPT_DESCRIPTION_CHARS:
+        job = dict(job, description=description[:PROMPT_DESCRIPTION_CHARS] + "...")
+    return {field: value for field, value in job.items() if value not in (None, "")}
+
 
+#Ranking prompt for one shard of jobs
+def matcher_prompt(profile, jobs):
     # 🧩 Build a compact prompt for Gemini
     prompt = f"""
     You are an AI job recommendation engine.
@@ -47,39 +125,71 @@ def ai_job_matcher():
     }}
     """
 
-    model = genai.GenerativeModel("gemini-2.5-flash")  # fast & cheap
-
-    try:
-        content = f"""
+    return f"""
         You are a ranking assistant that outputs clean JSON only.
 
         {prompt}
 
         Jobs JSON:
-        {json.dumps(jobs, indent=2)}
+        {json.dumps([prompt_job(job) for job in jobs], separators=(",", ":"))}
         """
 
-        result = model.generate_content(content)
-
-        # Attempt to parse Gemini output
-        text = result.text.strip()
-        start = text.find("{")
-        end = text.rfind("}") + 1
-        json_str = text[start:end]
-
-        ai_output = json.loads(json_str)
-        ranked_jobs = ai_output.get("ranked_jobs", [])
-
-        # Sort jobs by match_score descending
-        ranked_jobs = sorted(ranked_jobs, key=lambda j: j.get("match_score", 0), reverse=True)
-
-        # 🧠 Debug print - show reasoning
-        for r in ranked_jobs:
-            print(f"🔹 Job ID {r.get('id')}: {r.get('reason', 'No reason provided')} (Score: {r.get('match_score', '?')})")
-
-        return jsonify({"ranked_jobs": ranked_jobs})
-
+@app.route("/ai-job-matcher", methods=["POST", "OPTIONS"])
+@cross_origin(origins=["http://localhost:5173"], supports_credentials=True, 
+              allow_headers=["Content-Type", "Authorization"])
+@signin_required()
+def ai_job_matcher():
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    if not isinstance(data.get("filters") or {}, dict):
+        return jsonify({"error": "filters must be an object"}), 400
+    user = current_user()
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    profile = profile_dict(user, current_profile())
+    profile["experience"] = profile.get("work_experience")
 
-    except Exception as e:
-        print("Gemini parsing error:", e)
-        return jsonify({"ranked_jobs": jobs})  # fallback
+    try:
+        jobs = load_candidate_jobs(data, profile)
+    except (TypeError, ValueError):
+        return jsonify({"error": "job_ids must be a list of integers"}), 400
+    if not jobs:
+        return jsonify({"ranked_jobs": [], "ranked_by": "local"})
+
+    # Pre-rank locally so only the strongest candidates reach the model
+    top_k = max(1, request.args.get("top_k", app.config['AI_MATCHER_TOP_K'], type=int))
+    ranking = rank_jobs(profile, jobs, top_k)
+    offline = app.config['AI_MATCHER_OFFLINE'] or bool(data.get("offline")) or request.args.get("offline") == "1"
+    if offline:
+        return jsonify({"ranked_jobs": local_ranking(ranking, jobs), "ranked_by": "local"})
+    candidates = [jobs[i] for i, _, _ in ranking]
+
+    # Reuse stored scores for this profile; only jobs never scored against it go to the model
+    profile_fp = profile_fingerprint(profile)
+    cached = ranking_cache.lookup(profile_fp, candidates)
+    pending = [job for job in candidates if job["id"] not in cached]
+    if not pending:
+        return jsonify({"ranked_jobs": sort_by_score(list(cached.values())), "ranked_by": "gemini", "cached": len(cached), "partial": False})
+
+    # Rank the rest in parallel shards, each calibrated against the local scores so shards merge on
+    # one scale; anything the model did not score in time keeps its local score
+    local_entries = local_ranking(ranking, jobs)
+    ranked_jobs, unscored, partial = sharded_ranker.rank(
+        lambda shard: matcher_prompt(profile, shard), pending,
+        reference={entry["id"]: entry["match_score"] for entry in local_entries},
+    )
+    ranking_cache.store(session.get("user_id"), profile_fp, pending, ranked_jobs)
+    if unscored:
+        app.logger.warning("Gemini left jobs unscored: %s%s", unscored, " (deadline hit)" if partial else "")
+    fallback = calibrated_fallback(local_entries, ranked_jobs + list(cached.values()), set(unscored))
+
+    # Sort jobs by match_score descending
+    ranked_by = "gemini" if ranked_jobs or cached else "local"
+    ranked_jobs = sort_by_score(ranked_jobs + list(cached.values()) + fallback)
+
+    # 🧠 Debug print - show reasoning
+    for r in ranked_jobs:
+        print(f"🔹 Job ID {r.get('id')}: {r.get('reason', 'No reason provided')} (Score: {r.get('match_score', '?')})")
+
+    return jsonify({"ranked_jobs": ranked_jobs, "ranked_by": ranked_by, "cached": len(cached), "partial": partial})
@@ -1,32 +1,135 @@
-from medjobhub import app, session, db, Mail,datetime,cross_origin,allowed_url
-from flask import request, jsonify
+from medjobhub import app, session, db, Mail,datetime,timedelta,cross_origin,allowed_url,requested_fields
+from flask import request, jsonify, Response, stream_with_context
 from flask_mail import Message
+from sqlalchemy import func, select
+import csv, io, json
 from medjobhub.models import JobApplication, Job
-
-mail = Mail(app)
+from medjobhub.services import mail_outbox, signin_required, role_required
 
 #Employer_Applications
 @app.route('/employer_applications', methods=['GET'])
 @cross_origin(origin=allowed_url, supports_credentials=True)
+@role_required("employer", "Unauthorized access.")
 def employer_applications():
-    if 'user_id' not in session or session['role'] != 'employer':
-        return jsonify({"success": False, "message": "Unauthorized access."})
-    
     user_id = session['user_id']
-    applications = JobApplication.query.join(Job).filter(Job.posted_by == user_id).all()
-    applications_data = [app.to_dict() for app in applications]
+    fields = requested_fields(JobApplication)
+    applications = JobApplication.query.join(Job).filter(Job.posted_by == user_id).options(*JobApplication.to_dict_options(fields)).all()
+    applications_data = [app.to_dict(fields) for app in applications]
     
     return jsonify({"success": True, "applications": applications_data})
 
 
 
+#Export_Applications (streamed NDJSON or CSV)
+EXPORT_BATCH_SIZE = 500
+EXPORT_COLUMNS = [
+    JobApplication.id, JobApplication.job_id, Job.title.label("job_title"), Job.company.label("job_company"),
+    Job.location.label("job_location"), JobApplication.user_id, JobApplication.applicant_name,
+    JobApplication.email, JobApplication.phone, JobApplication.resume_link, JobApplication.applied_on,
+    JobApplication.qualifications, JobApplication.experience, JobApplication.preferred_shift,
+    JobApplication.expected_salary, JobApplication.application_status, JobApplication.cover_letter,
+]
+
+
+def export_row(row):
+    data = row._asdict()
+    data["applied_on"] = data["applied_on"].isoformat() if data["applied_on"] else None
+    return data
+
+
+@app.route('/export_applications', methods=['GET'])
+@cross_origin(origin=allowed_url, supports_credentials=True)
+@role_required("employer", "Unauthorized access.")
+def export_applications():
+    fmt = 'csv' if request.args.get('format') == 'csv' else 'ndjson'
+    statement = select(*EXPORT_COLUMNS).join(Job, JobApplication.job_id == Job.id).where(
+        Job.posted_by == session['user_id']
+    ).order_by(JobApplication.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    # Plain column rows fetched in batches: nothing is hydrated into ORM objects
+    def generate():
+        rows = db.session.execute(statement)
+        if fmt == 'ndjson':
+            for row in rows:
+                yield json.dumps(export_row(row)) + "\n"
+            return
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=[column.key for column in EXPORT_COLUMNS])
+        writer.writeheader()
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow(export_row(row))
+            if buffer.tell() >= 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=applications.{fmt}"}
+    )
+
+
+#Employer_Stats
+@app.route('/employer_stats', methods=['GET'])
+@cross_origin(origin=allowed_url, supports_credentials=True)
+@role_required("employer", "Unauthorized access.")
+def employer_stats():
+    user_id = session['user_id']
+    days = max(1, min(request.args.get('days', 30, type=int), 365))
+
+    # Aggregates only: every figure below is a GROUP BY over job_applications joined to jobs
+    per_job_status = db.session.query(
+        Job.id, Job.title, JobApplication.application_status, func.count(JobApplication.id)
+    ).outerjoin(JobApplication, JobApplication.job_id == Job.id).filter(
+        Job.posted_by == user_id
+    ).group_by(Job.id, Job.title, JobApplication.application_status).all()
+
+    jobs = {}
+    for job_id, title, status, count in per_job_status:
+        job = jobs.setdefault(job_id, {"job_id": job_id, "title": title, "total": 0, "by_status": {}})
+        if status is not None:
+            job["by_status"][status] = count
+            job["total"] += count
+
+    employer_apps = db.session.query(JobApplication).join(Job, JobApplication.job_id == Job.id).filter(Job.posted_by == user_id)
+
+    by_status = dict(employer_apps.with_entities(
+        JobApplication.application_status, func.count(JobApplication.id)
+    ).group_by(JobApplication.application_status).all())
+
+    day = func.date(JobApplication.applied_on)
+    per_day = employer_apps.with_entities(day, func.count(JobApplication.id)).filter(
+        JobApplication.applied_on >= datetime.utcnow() - timedelta(days=days)
+    ).group_by(day).order_by(day).all()
+
+    total, average_salary = employer_apps.with_entities(
+        func.count(JobApplication.id), func.avg(JobApplication.expected_salary)
+    ).one()
+
+    return jsonify({
+        "success": True,
+        "stats": {
+            "total_applications": total,
+            "average_expected_salary": round(average_salary, 2) if average_salary is not None else None,
+            "by_status": by_status,
+            "per_job": list(jobs.values()),
+            "per_day": [{"date": str(date), "count": count} for date, count in per_day]
+        }
+    })
+
+
 #Update Application
 @app.route('/update_application/<int:application_id>', methods=['POST'])
 @cross_origin(origin=allowed_url, supports_credentials=True)
+@role_required("employer", "Unauthorized access.")
 def update_application_status(application_id):
-    if 'user_id' not in session or session['role'] != 'employer':
-        return jsonify({"success": False, "message": "Unauthorized access."})
-    
     application = JobApplication.query.get(application_id)
     if not application:
         return jsonify({"success": False, "message": "Application not found."})
@@ -39,7 +142,7 @@ def update_application_status(application_id):
         db.session.commit()
         msg = Message("Application Rejected - MedJobHub", sender="noreply@medjobhub.com", recipients=[application.email])
         msg.body = f"Dear {application.applicant_name},\n\nWe regret to inform you that your application has been rejected.\n\nBest Wishes,\nMedJobHub Team"
-        mail.send(msg)
+        mail_outbox.enqueue(msg)
         return jsonify({"success": True, "message": "Application rejected and email sent."})
     
     db.session.commit()
@@ -48,10 +151,8 @@ def update_application_status(application_id):
 
 #Apply_Job
 @app.route('/apply_job/<int:job_id>', methods=['POST'])
+@role_required("job_seeker")
 def apply_job(job_id):
-    if 'user_id' not in session or session['role'] == 'employer':
-        return jsonify({"success": False, "message": "Unauthorized access"})
-    
     job = Job.query.get(job_id)
     if not job:
         return jsonify({"success": False, "message": "Job not found"})
@@ -79,22 +180,19 @@ def apply_job(job_id):
 
 #Jobseeker_Applications
 @app.route('/jobseeker_applications', methods=['GET'])
+@role_required("job_seeker", "Unauthorized access.")
 def jobseeker_applications():
-    if 'user_id' not in session or session['role'] == 'employer':
-        return jsonify({"success": False, "message": "Unauthorized access."})
-    
-    applications = JobApplication.query.filter_by(user_id=session.get('user_id')).all()
-    applications_data = [app.to_dict() for app in applications]
+    fields = requested_fields(JobApplication)
+    applications = JobApplication.query.options(*JobApplication.to_dict_options(fields)).filter_by(user_id=session.get('user_id')).all()
+    applications_data = [app.to_dict(fields) for app in applications]
     
     return jsonify({"success": True, "applications": applications_data})
 
 
 #Delete_Applications
 @app.route('/delete_application/<int:application_id>', methods=['POST'])
+@signin_required("Unauthorized access.")
 def delete_application(application_id):
-    if 'user_id' not in session:
-        return jsonify({"success": False, "message": "Unauthorized access."})
-    
     application = JobApplication.query.get(application_id)
     if not application or application.user_id != session['user_id']:
         return jsonify({"success": False, "message": "Unauthorized action."})
@@ -1,7 +1,8 @@
 # chatbot.py (updated)
 from medjobhub import app, session, jsonify, cross_origin, allowed_url, request
-from medjobhub.models import User, Job, JobApplication
-from medjobhub.routes.profile import get_current_user_profile
+from medjobhub.routes.profile import profile_dict
+from medjobhub.services import current_user, current_profile, build_chat_context, minimal_chat_context
+from medjobhub.services.tag_stream import TagStreamParser, DELTA, PARA, JSON
 import google.generativeai as genai
 import json
 import logging
@@ -11,6 +12,15 @@ from flask import stream_with_context, Response
 app.logger.setLevel(logging.DEBUG)
 
 
+# SSE sender per parser event: "bot" paragraphs, "final" JSON, and with ?partial=1 the
+# in-progress paragraph text as "bot_delta" frames (the full "bot" paragraph still follows)
+SSE_SENDERS = {DELTA: "bot_delta", PARA: "bot", JSON: "final"}
+
+
+def sse_event(kind, text):
+    return f"data: {json.dumps({'sender': SSE_SENDERS[kind], 'text': text})}\n\n"
+
+
 @app.route("/chatbot_stream", methods=["GET"])
 def chatbot_stream():
     # Quick auth guard
@@ -20,46 +30,31 @@ def chatbot_stream():
 
     # SSE uses GET; message passed as query param
     user_msg = request.args.get("message", "") or ""
+    partial = request.args.get("partial") == "1"
     user_id = session.get("user_id")
     app.logger.info("[STREAM] incoming chat stream request user_id=%s msg_len=%d", user_id, len(user_msg))
 
     # --- Load data (profile, jobs, apps) ---
     try:
-        user = User.query.get(user_id)
+        user = current_user()
         role = getattr(user, "role", "job_seeker")
     except Exception as e:
         app.logger.exception("[STREAM] failed to fetch user")
         return Response("Server error", status=500)
+    if not user:
+        return Response("Unauthorized", status=401)
 
-    try:
-        prof_data = get_current_user_profile().json
-        profile = prof_data.get("user", {}) if isinstance(prof_data, dict) else {}
-    except Exception as e:
-        app.logger.exception("[STREAM] failed to fetch profile")
-        profile = {}
-
-    try:
-        jobs = [j.to_dict() for j in Job.query.all()]
-    except Exception as e:
-        app.logger.exception("[STREAM] failed to fetch jobs")
-        jobs = []
+    profile = profile_dict(user, current_profile())
 
+    # Only the jobs/applications relevant to this message, compact and within the token budget
     try:
-        if role == "employer":
-            apps_q = JobApplication.query.join(Job).filter(Job.posted_by == user.id).all()
-        else:
-            apps_q = JobApplication.query.filter_by(user_id=user.id).all()
-        apps = [a.to_dict() for a in apps_q]
+        context = build_chat_context(user, profile, user_msg)
     except Exception as e:
-        app.logger.exception("[STREAM] failed to fetch applications")
-        apps = []
-
-    app.logger.debug("[STREAM] profile keys: %s", list(profile.keys()) if isinstance(profile, dict) else str(type(profile)))
-    app.logger.debug("[STREAM] jobs_count=%d apps_count=%d", len(jobs), len(apps))
-    if len(jobs) > 0:
-        app.logger.debug("[STREAM] jobs sample: %s", json.dumps(jobs[:2], indent=2))
-    if len(apps) > 0:
-        app.logger.debug("[STREAM] apps sample: %s", json.dumps(apps[:2], indent=2))
+        app.logger.exception("[STREAM] failed to build context; continuing with the profile only")
+        context = minimal_chat_context(profile)
+    stats = context["stats"]
+    app.logger.debug("[STREAM] context jobs %d/%d apps %d/%d truncated=%s", stats["jobs_shown"], stats["jobs_total"],
+                     stats["applications_shown"], stats["applications_total"], stats["truncated"])
 
     # --- System prompt (PARA protocol instructions) ---
     system_prompt = f"""
@@ -68,13 +63,19 @@ You are MedJobHub's AI Assistant.
 USER ROLE: {role}
 
 USER PROFILE:
-{json.dumps(profile, indent=2)}
+{context["profile"]}
 
-ALL JOBS:
-{json.dumps(jobs, indent=2)}
+JOB BOARD SUMMARY:
+{context["summary"]}
 
-USER APPLICATIONS:
-{json.dumps(apps, indent=2)}
+RELEVANT JOBS (showing {stats["jobs_shown"]} of {stats["jobs_total"]}, one JSON object per line):
+{context["jobs"]}
+
+USER APPLICATIONS (showing {stats["applications_shown"]} of {stats["applications_total"]}, one JSON object per line):
+{context["applications"]}
+
+Only the jobs and applications listed above are available to you. For counts, use the
+summary; if the user asks about something not listed, say that you are showing a subset.
 
 IMPORTANT STREAMING FORMAT:
 - Respond using <PARA> blocks for human-readable paragraphs.
@@ -110,38 +111,22 @@ Final JSON format (wrapped in <JSON>...</JSON>):
             # start streaming from the model
             resp = model.generate_content(system_prompt + "\nUSER: " + user_msg, stream=True)
 
-            buffer = ""
+            parser = TagStreamParser(partial=partial)
             for chunk in resp:
                 # chunk.text may be None or empty; use getattr safely
                 text = getattr(chunk, "text", None)
                 if not text:
                     continue
 
-                buffer += text
-
-                # emit all complete <PARA> blocks found in buffer
-                while "<PARA>" in buffer and "</PARA>" in buffer:
-                    start = buffer.index("<PARA>") + len("<PARA>")
-                    end = buffer.index("</PARA>")
-                    para = buffer[start:end].strip()
-                    buffer = buffer[end + len("</PARA>"):]
-                    app.logger.debug("[STREAM] emitting PARA (len=%d)", len(para))
-                    yield f"data: {json.dumps({'sender': 'bot', 'text': para})}\n\n"
-
-                # detect final JSON block and finish
-                if "<JSON>" in buffer and "</JSON>" in buffer:
-                    start = buffer.index("<JSON>") + len("<JSON>")
-                    end = buffer.index("</JSON>")
-                    json_block = buffer[start:end].strip()
-                    buffer = ""  # clear leftover
-                    app.logger.debug("[STREAM] emitting FINAL JSON")
-                    yield f"data: {json.dumps({'sender': 'final', 'text': json_block})}\n\n"
-                    return  # end generator after final JSON
-
-            # If loop ends without a final JSON, but we have leftover text, emit it as a PARA
-            if buffer.strip():
-                app.logger.debug("[STREAM] emitting leftover PARA at end (len=%d)", len(buffer.strip()))
-                yield f"data: {json.dumps({'sender': 'bot', 'text': buffer.strip()})}\n\n"
+                for kind, body in parser.feed(text):
+                    yield sse_event(kind, body)
+                    if kind == JSON:
+                        return  # end generator after final JSON
+
+            # If the stream ends without a final JSON, leftover text goes out as a PARA
+            for kind, body in parser.close():
+                app.logger.debug("[STREAM] emitting leftover PARA at end (len=%d)", len(body))
+                yield sse_event(kind, body)
 
         except Exception as e:
             # Log and inform client gracefully
@@ -163,6 +148,7 @@ Final JSON format (wrapped in <JSON>...</JSON>):
         mimetype="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no"
+            "X-Accel-Buffering": "no",
+            "X-Chat-Context": f"jobs={stats['jobs_shown']}/{stats['jobs_total']}; applications={stats['applications_shown']}/{stats['applications_total']}"
         }
     )
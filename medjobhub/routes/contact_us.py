@@ -1,16 +1,15 @@
 from medjobhub import request, jsonify,Mail,Message,app
-mail=Mail(app)
+from medjobhub.services import mail_outbox
 
 
 #Sending Response Email for Contact Message
 def send_contact_response_email(recipient_email, username):
-    with app.app_context():
-        msg = Message(
-            'Thank You for Contacting MedJobHub!',
-            sender="MedJobHub <medjobhub>",
-            recipients=[recipient_email]
-        )
-        msg.body = f"""
+    msg = Message(
+        'Thank You for Contacting MedJobHub!',
+        sender="MedJobHub <medjobhub>",
+        recipients=[recipient_email]
+    )
+    msg.body = f"""
 Hello {username},
 
 Thank you for reaching out to us! We have received your message and will get back to you as soon as possible. 
@@ -21,13 +20,12 @@ If your request is urgent, feel free to reply to this email or contact us direct
 Best regards,  
 The MedJobHub Team  
 """
-        try:
-            mail.send(msg)
-            print("Response email sent successfully!")
-            return True
-        except Exception as e:
-            print(f"Error sending response email: {e}")
-            return False
+    try:
+        mail_outbox.enqueue(msg)
+        return True
+    except Exception as e:
+        print(f"Error queueing response email: {e}")
+        return False
 
 
 #Contact_US
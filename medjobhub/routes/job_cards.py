@@ -1,16 +1,57 @@
-from medjobhub import app, db, session, jsonify, request, datetime,cross_origin,allowed_url
-from medjobhub.models import User, Job, JobApplication
+from medjobhub import app, db, session, jsonify, request, datetime,cross_origin,allowed_url,requested_fields
+from medjobhub.models import Job, JobApplication
+from sqlalchemy import insert
+import csv, io, json
+from medjobhub.services import index_job, index_job_rows, unindex_job, search_job_ids, build_like_filter, fts_available, jobs_generation, cached_json_response, identity_cache, signin_required, role_required, job_vectors
+
+#Column values for a posted job; raises ValueError/TypeError on invalid input
+REQUIRED_JOB_FIELDS = ['title', 'company', 'location', 'description']
+
+
+def job_values(job_data, user):
+    values = dict(
+        title=job_data.get('title'),
+        company=job_data.get('company') or user.company_name,
+        location=job_data.get('location'),
+        description=job_data.get('description'),
+        salary=float(job_data.get('salary', 0)),
+        posted_by=user.id,
+        posted_on=datetime.utcnow(),
+        employment_type=job_data.get('employment_type', 'Full-time'),
+        specialization=job_data.get('specialization'),
+        required_experience=job_data.get('required_experience'),
+        required_qualifications=job_data.get('required_qualifications'),
+        shift_timing=job_data.get('shift_timing'),
+        job_type=job_data.get('job_type', 'Hospital'),
+        application_deadline=datetime.strptime(job_data.get('application_deadline'), '%Y-%m-%d') if job_data.get('application_deadline') else None,
+        benefits=job_data.get('benefits'),
+        contact_email=job_data.get('contact_email') or user.email,
+        contact_phone=job_data.get('contact_phone') or user.phone
+    )
+    missing = [field for field in REQUIRED_JOB_FIELDS if not values[field]]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    return values
+
+
+#The vector index is derived data rebuilt from the jobs table, so a failed update is logged
+#rather than failing a write that has already committed
+def refresh_job_vectors(added=(), removed=()):
+    try:
+        if added:
+            job_vectors.add(added)
+        for job_id in removed:
+            job_vectors.remove(job_id)
+    except Exception:
+        app.logger.exception("Job vector index update failed")
+
 
 #Add Job
 @app.route("/add_job", methods=["POST"])
+@signin_required("Please sign in to access this page")
+@role_required("employer", "You don't have permission to access this page")
 def add_job():
-    if 'user_id' not in session:
-        return jsonify({"success": False, "message": "Please sign in to access this page"})
-    
-    if session['role'] != 'employer':
-        return jsonify({"success": False, "message": "You don't have permission to access this page"})
-    
-    user = User.query.get(session['user_id'])
+    user = identity_cache.by_id(session['user_id'])
     
     if not user or user.role != "employer":
         return jsonify({"success": False, "message": "Only employers can post jobs."})
@@ -18,61 +59,233 @@ def add_job():
     job_data = request.get_json()
     
     try:
-        new_job = Job(
-            title=job_data.get('title'),
-            company=job_data.get('company') or user.company_name,
-            location=job_data.get('location'),
-            description=job_data.get('description'),
-            salary=float(job_data.get('salary', 0)),
-            posted_by=user.id,
-            posted_on=datetime.utcnow(),
-            employment_type=job_data.get('employment_type', 'Full-time'),
-            specialization=job_data.get('specialization'),
-            required_experience=job_data.get('required_experience'),
-            required_qualifications=job_data.get('required_qualifications'),
-            shift_timing=job_data.get('shift_timing'),
-            job_type=job_data.get('job_type', 'Hospital'),
-            application_deadline=datetime.strptime(job_data.get('application_deadline'), '%Y-%m-%d') if job_data.get('application_deadline') else None,
-            benefits=job_data.get('benefits'),
-            contact_email=job_data.get('contact_email') or user.email,
-            contact_phone=job_data.get('contact_phone') or user.phone
-        )
+        new_job = Job(**job_values(job_data, user))
         db.session.add(new_job)
+        db.session.flush()
+        index_job(new_job)
         db.session.commit()
+        jobs_generation.bump()
+        refresh_job_vectors(added=[new_job])
         return jsonify({"success": True, "message": "Job posted successfully!"})
     except Exception as e:
+        db.session.rollback()
         return jsonify({"success": False, "message": "Error posting job."})
 
 
+#Bulk job import (CSV or NDJSON), parsed as a stream and inserted in batches
+BULK_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+
+def bulk_format():
+    requested = (request.args.get('format') or '').lower()
+    if requested in ('csv', 'ndjson'):
+        return requested
+    content_type = request.mimetype
+    if content_type == 'multipart/form-data' and 'file' in request.files:
+        filename = (request.files['file'].filename or '').lower()
+        return 'csv' if filename.endswith('.csv') else 'ndjson'
+    return 'csv' if content_type in ('text/csv', 'application/csv') else 'ndjson'
+
+
+def bulk_upload_stream():
+    # Multipart uploads are spooled to disk by werkzeug; raw bodies are read straight off the socket
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('file')
+        return upload.stream if upload else None
+    return request.stream
+
+
+#Yields one dict per record, or the ValueError describing why a record is unusable
+def iter_bulk_rows(text_stream, fmt):
+    if fmt == 'csv':
+        for row in csv.DictReader(text_stream):
+            yield {key.strip(): value for key, value in row.items() if key and value not in (None, '')}
+        return
+    for line in text_stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield e
+            continue
+        yield row if isinstance(row, dict) else ValueError("Each line must be a JSON object.")
+
+
+def insert_job_batch(batch):
+    ids = db.session.execute(insert(Job).returning(Job.id, sort_by_parameter_order=True), batch).scalars().all()
+    rows = [{"id": job_id, **values} for job_id, values in zip(ids, batch)]
+    index_job_rows(rows)
+    db.session.commit()
+    refresh_job_vectors(added=rows)
+    return len(ids)
+
+
+@app.route("/add_jobs_bulk", methods=["POST"])
+@role_required("employer", "You don't have permission to access this page")
+def add_jobs_bulk():
+    user = identity_cache.by_id(session['user_id'])
+    if not user or user.role != "employer":
+        return jsonify({"success": False, "message": "Only employers can post jobs."})
+
+    stream = bulk_upload_stream()
+    if stream is None:
+        return jsonify({"success": False, "message": "No file provided"})
+
+    fmt = bulk_format()
+    rows = iter_bulk_rows(io.TextIOWrapper(stream, encoding='utf-8', newline=''), fmt)
+    batch, errors = [], []
+    inserted = failed = row_number = 0
+
+    try:
+        for row_number, row in enumerate(rows, start=1):
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                batch.append(job_values(row, user))
+            except (ValueError, TypeError) as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"row": row_number, "message": str(e)})
+                continue
+
+            if len(batch) >= BULK_BATCH_SIZE:
+                inserted += insert_job_batch(batch)
+                batch = []
+
+        if batch:
+            inserted += insert_job_batch(batch)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            "success": False,
+            "message": f"Import stopped at row {row_number}: {str(e)}",
+            "inserted": inserted,
+            "errors": errors
+        })
+    finally:
+        if inserted:
+            jobs_generation.bump()
+
+    return jsonify({
+        "success": True,
+        "message": f"Imported {inserted} jobs.",
+        "inserted": inserted,
+        "failed": failed,
+        "errors": errors
+    })
+
+
 #Employer_Jobs
 @app.route('/your_jobs', methods=['GET'])
 @cross_origin(origin=allowed_url, supports_credentials=True)
+@role_required("employer")
 def your_jobs():
-    if 'user_id' not in session or session['role'] != 'employer':
-        return jsonify({"success": False, "message": "Unauthorized access"})
-    
     user_id = session['user_id']
-    jobs = Job.query.filter_by(posted_by=user_id).all()
-    return jsonify({"success": True, "jobs": [job.to_dict() for job in jobs]})
+    fields = requested_fields(Job)
+    jobs = Job.query.options(*Job.to_dict_options(fields)).filter_by(posted_by=user_id).all()
+    return jsonify({"success": True, "jobs": [job.to_dict(fields) for job in jobs]})
+
+
+#Available_Jobs filters and paging
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+JOB_FILTER_FIELDS = ['location', 'specialization', 'employment_type', 'job_type']
+
+
+def job_filters(args):
+    filters = []
+    for field in JOB_FILTER_FIELDS:
+        value = (args.get(field) or '').strip()
+        if value:
+            filters.append(getattr(Job, field) == value)
+
+    min_salary = args.get('min_salary', type=float)
+    max_salary = args.get('max_salary', type=float)
+    if min_salary is not None:
+        filters.append(Job.salary >= min_salary)
+    if max_salary is not None:
+        filters.append(Job.salary <= max_salary)
+    return filters
+
+
+def page_size(args):
+    limit = args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    return max(1, min(limit, MAX_PAGE_SIZE))
 
 
 #Available_Jobs
 @app.route('/available_jobs', methods=['GET'])
 @cross_origin(origin=allowed_url, supports_credentials=True)
+@role_required("job_seeker")
 def available_jobs():
-    if 'user_id' not in session or session['role'] == 'employer':
-        return jsonify({"success": False, "message": "Unauthorized access"})
-    
-    jobs = Job.query.all()
-    return jsonify({"success": True, "jobs": [job.to_dict() for job in jobs]})
+    return cached_json_response(list_available_jobs)
+
+
+def list_available_jobs():
+    limit = page_size(request.args)
+    cursor = request.args.get('cursor', type=int)
+    fields = requested_fields(Job)
+
+    # Keyset pagination: newest first, the cursor is the last id of the previous page
+    query = Job.query.options(*Job.to_dict_options(fields)).filter(*job_filters(request.args))
+    if cursor is not None:
+        query = query.filter(Job.id < cursor)
+    jobs = query.order_by(Job.id.desc()).limit(limit + 1).all()
+
+    has_more = len(jobs) > limit
+    jobs = jobs[:limit]
+    return {
+        "success": True,
+        "jobs": [job.to_dict(fields) for job in jobs],
+        "next_cursor": jobs[-1].id if has_more else None,
+        "has_more": has_more
+    }
+
+
+#Search_Jobs
+@app.route('/search_jobs', methods=['GET'])
+@cross_origin(origin=allowed_url, supports_credentials=True)
+@signin_required()
+def search_jobs():
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({"success": False, "message": "Search query is required."})
+
+    limit = page_size(request.args)
+    page = max(1, request.args.get('page', 1, type=int))
+    offset = (page - 1) * limit
+    fields = requested_fields(Job)
+
+    if not fts_available():
+        # Server databases have no FTS5; fall back to an unranked substring match on the same columns
+        base = Job.query.filter(build_like_filter(query))
+        total = base.count()
+        jobs = base.options(*Job.to_dict_options(fields)).order_by(Job.id.desc()).offset(offset).limit(limit).all()
+        results = [{"job": job.to_dict(fields), "rank": None, "snippet": None} for job in jobs]
+    else:
+        hits, total = search_job_ids(query, limit, offset)
+        jobs_by_id = {job.id: job for job in Job.query.options(*Job.to_dict_options(fields)).filter(Job.id.in_([job_id for job_id, _, _ in hits])).all()}
+        results = [
+            {"job": jobs_by_id[job_id].to_dict(fields), "rank": rank, "snippet": snippet}
+            for job_id, rank, snippet in hits if job_id in jobs_by_id
+        ]
+
+    return jsonify({
+        "success": True,
+        "results": results,
+        "total": total,
+        "page": page,
+        "has_more": offset + len(results) < total
+    })
 
 
 #Delete_Jobs
 @app.route('/delete_job/<int:job_id>', methods=['POST'])
+@signin_required()
 def delete_job(job_id):
-    if 'user_id' not in session:
-        return jsonify({"success": False, "message": "Please sign in to continue"})
-    
     job = Job.query.get(job_id)
     if not job:
         return jsonify({"success": False, "message": "Job not found"})
@@ -81,21 +294,51 @@ def delete_job(job_id):
         return jsonify({"success": False, "message": "Unauthorized"})
     
     JobApplication.query.filter_by(job_id=job.id).delete()
+    unindex_job(job.id)
     db.session.delete(job)
     db.session.commit()
+    jobs_generation.bump()
+    refresh_job_vectors(removed=[job_id])
     return jsonify({"success": True, "message": "Job deleted successfully"})
 
 
 #Job_Details
 @app.route('/job_details/<int:job_id>', methods=['GET'])
 @cross_origin(origin=allowed_url, supports_credentials=True)
-
+@signin_required()
 def job_details(job_id):
-    if 'user_id' not in session:
-        return jsonify({"success": False, "message": "Please sign in to continue"})
-    
-    job = Job.query.get(job_id)
+    return cached_json_response(lambda: job_details_payload(job_id))
+
+
+def job_details_payload(job_id):
+    job = Job.query.options(*Job.to_dict_options()).get(job_id)
     if not job:
-        return jsonify({"success": False, "message": "Job not found"})
+        return {"success": False, "message": "Job not found"}
     
-    return jsonify({"success": True, "job": job.to_dict()})
\ No newline at end of file
+    return {"success": True, "job": job.to_dict()}
+
+
+#Similar_Jobs: nearest postings by cosine similarity of their hashed text vectors
+@app.route('/similar_jobs/<int:job_id>', methods=['GET'])
+@cross_origin(origin=allowed_url, supports_credentials=True)
+@signin_required()
+def similar_jobs(job_id):
+    return cached_json_response(lambda: similar_jobs_payload(job_id))
+
+
+def similar_jobs_payload(job_id):
+    limit = max(1, min(request.args.get('limit', 10, type=int), MAX_PAGE_SIZE))
+    fields = requested_fields(Job) or Job.CARD_FIELDS
+    neighbours = job_vectors.similar(job_id, limit)
+    if neighbours is None:
+        return {"success": False, "message": "Job not found"}
+
+    jobs_by_id = {job.id: job for job in Job.query.options(*Job.to_dict_options(fields)).filter(Job.id.in_([neighbour_id for neighbour_id, _ in neighbours])).all()}
+    return {
+        "success": True,
+        "job_id": job_id,
+        "results": [
+            {"job": jobs_by_id[neighbour_id].to_dict(fields), "similarity": round(similarity, 4)}
+            for neighbour_id, similarity in neighbours if neighbour_id in jobs_by_id
+        ]
+    }
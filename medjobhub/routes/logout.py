@@ -1,5 +1,6 @@
 from medjobhub import app,session,jsonify,db,cross_origin,allowed_url
 from medjobhub.models import User
+from medjobhub.services import identity_cache
 
 #Logout
 @app.route('/logout', methods=['POST'])
@@ -12,6 +13,7 @@ def logout():
 
         user = User.query.get(user_id)
         if user:
+            identity_cache.invalidate(user.id, user.auth_token)
             user.is_verified = False 
             user.auth_token = None
             db.session.commit() 
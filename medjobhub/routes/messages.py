@@ -0,0 +1,160 @@
+from medjobhub import app, db, session, jsonify, request, datetime, cross_origin, allowed_url
+from medjobhub.models import ChatMessage, Job, JobApplication
+from medjobhub.services import chat_broker, chat_writer, signin_required, LRUCache
+from flask import Response, stream_with_context
+from sqlalchemy import and_, or_
+import json
+import time
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_MESSAGE_LENGTH = 4000
+
+# (user id, user id) pairs already found to share an application; short TTL so a deleted
+# application stops authorizing the room soon after. Refusals are not cached, so a new
+# application opens the room right away.
+room_access = LRUCache(10000, ttl=300)
+
+
+#One room per employer/seeker pair, the same whichever side opens it
+def room_name(user_id, other_id):
+    return f"dm-{min(user_id, other_id)}-{max(user_id, other_id)}"
+
+
+#Messaging is open between an employer and a seeker who applied to one of their jobs
+def can_message(user_id, other_id):
+    key = (min(user_id, other_id), max(user_id, other_id))
+    allowed = room_access.get(key)
+    if allowed is None:
+        allowed = db.session.query(JobApplication.id).join(Job, JobApplication.job_id == Job.id).filter(or_(
+            and_(Job.posted_by == user_id, JobApplication.user_id == other_id),
+            and_(Job.posted_by == other_id, JobApplication.user_id == user_id)
+        )).first() is not None
+        if allowed:
+            room_access.set(key, True)
+    return allowed
+
+
+def cursor_for(message):
+    return f"{message.timestamp.isoformat()}~{message.id}"
+
+
+def parse_cursor(cursor):
+    timestamp, message_id = cursor.rsplit("~", 1)
+    return datetime.fromisoformat(timestamp), int(message_id)
+
+
+#Send_Message
+@app.route('/messages/<int:other_id>', methods=['POST'])
+@cross_origin(origin=allowed_url, supports_credentials=True)
+@signin_required()
+def send_message(other_id):
+    user_id = session['user_id']
+    if other_id == user_id or not can_message(user_id, other_id):
+        return jsonify({"success": False, "message": "You can only message employers and applicants you share an application with."})
+
+    text = ((request.get_json(silent=True) or {}).get('message') or '').strip()
+    if not text:
+        return jsonify({"success": False, "message": "Message cannot be empty."})
+    if len(text) > MAX_MESSAGE_LENGTH:
+        return jsonify({"success": False, "message": f"Messages are limited to {MAX_MESSAGE_LENGTH} characters."})
+
+    room = room_name(user_id, other_id)
+    row = dict(sender_id=user_id, receiver_id=other_id, message=text, room=room, timestamp=datetime.utcnow())
+    chat_writer.enqueue(row)
+    message = dict(row, timestamp=row['timestamp'].isoformat())
+    message['seq'] = chat_broker.publish(room, message)
+    return jsonify({"success": True, "message": message})
+
+
+#Message_History: newest first, paged with ?before=<next_cursor>
+@app.route('/messages/<int:other_id>', methods=['GET'])
+@cross_origin(origin=allowed_url, supports_credentials=True)
+@signin_required()
+def message_history(other_id):
+    user_id = session['user_id']
+    if not can_message(user_id, other_id):
+        return jsonify({"success": False, "message": "Unauthorized access"})
+
+    room = room_name(user_id, other_id)
+    limit = max(1, min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+    # Sequence before the read, so a stream started from it cannot miss anything sent meanwhile
+    seq = chat_broker.current_seq(room)
+    try:
+        chat_writer.flush()
+    except Exception:
+        # History is still served; messages not yet written show up once a retry succeeds
+        app.logger.exception("[CHAT] flush before history read failed")
+
+    query = ChatMessage.query.filter(ChatMessage.room == room)
+    before = request.args.get('before')
+    if before:
+        try:
+            timestamp, message_id = parse_cursor(before)
+        except ValueError:
+            return jsonify({"success": False, "message": "Invalid cursor."})
+        query = query.filter(or_(ChatMessage.timestamp < timestamp,
+                                 and_(ChatMessage.timestamp == timestamp, ChatMessage.id < message_id)))
+    messages = query.order_by(ChatMessage.timestamp.desc(), ChatMessage.id.desc()).limit(limit + 1).all()
+
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    return jsonify({
+        "success": True,
+        "room": room,
+        "messages": [message.to_dict() for message in messages],
+        "next_cursor": cursor_for(messages[-1]) if has_more else None,
+        "has_more": has_more,
+        "seq": seq
+    })
+
+
+#Message_Stream: SSE of new messages after ?after=<seq> (or the Last-Event-ID a reconnecting
+#EventSource sends). The stream closes after CHAT_STREAM_TIMEOUT seconds; clients reconnect.
+@app.route('/messages/<int:other_id>/stream', methods=['GET'])
+@cross_origin(origin=allowed_url, supports_credentials=True)
+@signin_required()
+def message_stream(other_id):
+    user_id = session['user_id']
+    if not can_message(user_id, other_id):
+        return Response("Unauthorized", status=401)
+
+    room = room_name(user_id, other_id)
+    after = request.headers.get('Last-Event-ID', type=int)
+    if after is None:
+        after = request.args.get('after', type=int)
+    if after is None:
+        after = chat_broker.current_seq(room)
+    keepalive = app.config['CHAT_STREAM_KEEPALIVE']
+    closes_at = time.monotonic() + app.config['CHAT_STREAM_TIMEOUT']
+
+    def generate(after):
+        while True:
+            remaining = closes_at - time.monotonic()
+            if remaining <= 0:
+                return
+            messages, missed = chat_broker.wait(room, after, min(keepalive, remaining))
+            if missed and not messages:
+                # The room's sequence restarted (server restart or eviction): reload history and
+                # continue from the current sequence, which the event id hands to EventSource
+                after = chat_broker.current_seq(room)
+                yield f"event: resync\nid: {after}\ndata: {{}}\n\n"
+                continue
+            if missed:
+                # The ring buffer moved past this client; it should reload history
+                yield "event: resync\ndata: {}\n\n"
+            if not messages:
+                yield ": keepalive\n\n"
+                continue
+            for message in messages:
+                yield f"id: {message['seq']}\ndata: {json.dumps(message)}\n\n"
+            after = messages[-1]['seq']
+
+    return Response(
+        stream_with_context(generate(after)),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -1,7 +1,8 @@
 from medjobhub import app, db, session, jsonify, request, cross_origin, allowed_url
-from medjobhub.models import User, UserProfile
+from medjobhub.models import UserProfile
 import cloudinary.uploader
 from medjobhub.routes.upload_cloudinary import upload_files_to_cloudinary
+from medjobhub.services import identity_cache, current_user, current_profile, signin_required
 from flask import Blueprint, request, send_file, render_template_string
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib import colors
@@ -14,63 +15,47 @@ from io import BytesIO
 from datetime import datetime
 from weasyprint import HTML
 
+PROFILE_FIELDS = (
+    "profile_pic_url", "linkedin", "github", "twitter", "portfolio_website",
+    "medical_license_number", "specialization", "certifications", "skills",
+    "education", "work_experience", "publications", "availability", "resume_url",
+    "company_website", "company_description", "industry", "company_size",
+    "founded_year", "headquarters_location", "company_logo",
+)
+
+#Flattened user + profile dict shared by /current_user_profile and the chatbot context
+def profile_dict(user, user_profile):
+    user_data = {
+        "id": user.id,
+        "username": user.username,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "phone": user.phone,
+        "gender": user.gender,
+        "age": user.age,
+        "address": user.address,
+        "role": user.role,
+        "company_name": user.company_name,
+        "resume": user.resume,
+        "is_verified": user.is_verified,
+    }
+    if user_profile:
+        user_data.update({field: getattr(user_profile, field) for field in PROFILE_FIELDS})
+    return user_data
+
 @app.route('/current_user_profile', methods=['GET', 'OPTIONS'])
 @cross_origin(origin="http://localhost:5173", supports_credentials=True)
+@signin_required("Please sign in to access profile")
 def get_current_user_profile():
-    if 'user_id' not in session:
-        return jsonify({"success": False, "message": "Please sign in to access profile"})
-    
     try:
-        user = User.query.get(session['user_id'])
+        user = current_user()
         if not user:
             return jsonify({"success": False, "message": "User not found"})
         
-        user_profile = UserProfile.query.filter_by(user_id=user.id).first()
-        
-        user_data = {
-            "id": user.id,
-            "username": user.username,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "email": user.email,
-            "phone": user.phone,
-            "gender": user.gender,
-            "age": user.age,
-            "address": user.address,
-            "role": user.role,
-            "company_name": user.company_name,
-            "resume": user.resume,
-            "is_verified": user.is_verified,
-        }
-        
-        if user_profile:
-            user_data.update({
-                "profile_pic_url": user_profile.profile_pic_url,
-                "linkedin": user_profile.linkedin,
-                "github": user_profile.github,
-                "twitter": user_profile.twitter,
-                "portfolio_website": user_profile.portfolio_website,
-                "medical_license_number": user_profile.medical_license_number,
-                "specialization": user_profile.specialization,
-                "certifications": user_profile.certifications,
-                "skills": user_profile.skills,
-                "education": user_profile.education,
-                "work_experience": user_profile.work_experience,
-                "publications": user_profile.publications,
-                "availability": user_profile.availability,
-                "resume_url": user_profile.resume_url,
-                "company_website": user_profile.company_website,
-                "company_description": user_profile.company_description,
-                "industry": user_profile.industry,
-                "company_size": user_profile.company_size,
-                "founded_year": user_profile.founded_year,
-                "headquarters_location": user_profile.headquarters_location,
-                "company_logo": user_profile.company_logo,
-            })
-        
         return jsonify({
             "success": True,
-            "user": user_data
+            "user": profile_dict(user, current_profile())
         })
         
     except Exception as e:
@@ -81,12 +66,10 @@ def get_current_user_profile():
 
 @app.route('/update_profile', methods=['POST', 'OPTIONS'])
 @cross_origin(origin="http://localhost:5173", supports_credentials=True)
+@signin_required("Please sign in to update profile")
 def update_profile():
-    if 'user_id' not in session:
-        return jsonify({"success": False, "message": "Please sign in to update profile"})
-    
     try:
-        user = User.query.get(session['user_id'])
+        user = current_user()
         if not user:
             return jsonify({"success": False, "message": "User not found"})
         
@@ -97,7 +80,7 @@ def update_profile():
             if field in data:
                 setattr(user, field, data[field])
         
-        user_profile = UserProfile.query.filter_by(user_id=user.id).first()
+        user_profile = current_profile()
         if not user_profile:
             user_profile = UserProfile(
                 user_id=user.id,
@@ -106,19 +89,12 @@ def update_profile():
             )
             db.session.add(user_profile)
         
-        profile_fields = [
-            'profile_pic_url', 'linkedin', 'github', 'twitter', 'portfolio_website',
-            'medical_license_number', 'specialization', 'certifications', 'skills',
-            'education', 'work_experience', 'publications', 'availability', 'resume_url',
-            'company_website', 'company_description', 'industry', 'company_size',
-            'founded_year', 'headquarters_location', 'company_logo'
-        ]
-        
-        for field in profile_fields:
+        for field in PROFILE_FIELDS:
             if field in data:
                 setattr(user_profile, field, data[field])
         
         db.session.commit()
+        identity_cache.invalidate(session['user_id'])
         
         return jsonify({
             "success": True,
@@ -134,12 +110,10 @@ def update_profile():
 
 @app.route('/upload_profile_picture', methods=['POST', 'OPTIONS'])
 @cross_origin(origin="http://localhost:5173", supports_credentials=True)
+@signin_required("Please sign in to upload profile picture")
 def upload_profile_picture():
-    if 'user_id' not in session:
-        return jsonify({"success": False, "message": "Please sign in to upload profile picture"})
-    
     try:
-        user = User.query.get(session['user_id'])
+        user = current_user()
         if not user:
             return jsonify({"success": False, "message": "User not found"})
         
@@ -164,7 +138,7 @@ def upload_profile_picture():
             
             profile_pic_url = upload_result['secure_url']
             
-            user_profile = UserProfile.query.filter_by(user_id=user.id).first()
+            user_profile = current_profile()
             if not user_profile:
                 user_profile = UserProfile(
                     user_id=user.id,
@@ -197,11 +171,11 @@ def generate_resume():
     if "user_id" not in session:
         return jsonify({"error": "Unauthorized"}), 401
 
-    user = User.query.get(session["user_id"])
+    user = current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    user_profile = UserProfile.query.filter_by(user_id=user.id).first()
+    user_profile = current_profile()
     print("Fetched UserProfile:", user_profile)
 
     if not user_profile:
@@ -1,31 +1,27 @@
 from medjobhub import app,Message,Mail,request,check_password_hash,random,session,jsonify,db,secrets,cross_origin,allowed_url
 from medjobhub.models import User
+from medjobhub.services import identity_cache, otp_service, mail_outbox, password_hasher, HashingBusy
 
 
-otp_storage = {} 
-mail=Mail(app)
-
 #Email for Otp
 def send_email(recipient_email, otp, username):
-    with app.app_context():
-        msg = Message(
-            'Your OTP for MedJobHub',
-            sender="MedJobHub <medjobhub>",
-            recipients=[recipient_email]
-        )
-        msg.body = f"""
+    msg = Message(
+        'Your OTP for MedJobHub',
+        sender="MedJobHub <medjobhub>",
+        recipients=[recipient_email]
+    )
+    msg.body = f"""
 Hello {username},
 Thank you for using our services. Your One-Time Password (OTP) is: {otp}
 This OTP is valid for 10 minutes. Please do not share this code.
 Best regards, MedJobHub Team
 """
-        try:
-            mail.send(msg)
-            print("Email sent successfully!")
-            return True
-        except Exception as e:
-            print(f"Error sending email: {e}")
-            return False
+    try:
+        mail_outbox.enqueue(msg)
+        return True
+    except Exception as e:
+        print(f"Error queueing email: {e}")
+        return False
         
 
 
@@ -41,12 +37,33 @@ def signin():
     user = User.query.filter_by(username=username).first()
 
     if user:
-        if check_password_hash(user.password, password):
+        try:
+            password_valid = password_hasher.verify(user.password, password)
+        except HashingBusy as e:
+            return jsonify({"success": False, "message": str(e)}), 503, {"Retry-After": str(e.retry_after)}
+
+        if password_valid:
+            # Move hashes made with older parameters to PASSWORD_HASH_METHOD while we have the password
+            if password_hasher.needs_rehash(user.password):
+                try:
+                    user.password = password_hasher.hash(password)
+                    db.session.commit()
+                except HashingBusy:
+                    pass
+
             if not user.is_verified:
-                otp = random.randint(100000, 999999)
-                session[f"otp_{username}"] = otp
-                print(f"Generated OTP for {username}: {otp}")  
-                print("sessions",session.items())
+                status, otp = otp_service.issue(username, request.remote_addr)
+                if status == otp_service.THROTTLED:
+                    return jsonify({"success": False, "message": "Too many sign-in attempts. Please try again later."}), 429
+
+                if status == otp_service.PENDING:
+                    return jsonify({
+                        "success": True,
+                        "message": "OTP already sent to your email.",
+                        "username": username,
+                        "otp_required": True,
+                        "resume":user.resume
+                    })
 
                 if send_email(user.email, otp, username):
                     return jsonify({
@@ -57,6 +74,7 @@ def signin():
                         "resume":user.resume
                     })
                 else:
+                    otp_service.discard(username)
                     return jsonify({"success": False, "message": "Error sending OTP. Try again later."})
             else:
                 session["user_id"] = user.id
@@ -64,9 +82,11 @@ def signin():
                 session.permanent = True 
 
                 auth_token = secrets.token_hex(16) 
+                identity_cache.invalidate(user.id, user.auth_token)
                 user.auth_token = auth_token 
                 user.is_verified = True 
                 db.session.commit()
+                identity_cache.remember(user)
 
                 return jsonify({
                     "success": True,
@@ -111,7 +131,7 @@ def verify_token():
         if not auth_token:
             return jsonify({"success": False, "message": "Token is required."}), 400
 
-        user = User.query.filter_by(auth_token=auth_token).first()
+        user = identity_cache.by_token(auth_token)
 
         if not user:
             return jsonify({"success": False, "message": "Invalid or expired token."}), 401
@@ -1,5 +1,6 @@
 from flask import request, jsonify
 from medjobhub import app, db, os, secure_filename, generate_password_hash,allowed_file
+from medjobhub.services import password_hasher, HashingBusy
 from medjobhub.models import User
 from medjobhub.models import UserProfile
 from werkzeug.exceptions import BadRequest
@@ -66,7 +67,7 @@ def signup():
         if role == "job_seeker" and not resume:
             return jsonify({"success": False, "message": "Resume is required for job seekers."})
 
-        hashed_password = generate_password_hash(password, method='pbkdf2:sha256')
+        hashed_password = password_hasher.hash(password)
 
         new_user = User(
             first_name=first_name,
@@ -105,5 +106,7 @@ def signup():
 
     except BadRequest:
         return jsonify({"success": False, "message": "Invalid request. Please check the form data."})
+    except HashingBusy as e:
+        return jsonify({"success": False, "message": str(e)}), 503, {"Retry-After": str(e.retry_after)}
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
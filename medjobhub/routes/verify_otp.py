@@ -1,5 +1,6 @@
 from medjobhub import app, request, session, db, os,secrets,allowed_url,cross_origin
 from medjobhub.models import User
+from medjobhub.services import identity_cache, otp_service
 from flask import jsonify
 
 SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
@@ -16,12 +17,15 @@ def verify_otp():
         if not username or not entered_otp:
             return jsonify({"success": False, "message": "Username and OTP are required."}), 400
         
-        print(f"Username recieved at verify page is: ",{username})
-        print("sessions",session.items())
-        
-        stored_otp = session[f"otp_{username}"]
-        print(f"OTP recieved at verify page is: ",{stored_otp})
-        if stored_otp and int(entered_otp) == stored_otp:
+        status = otp_service.verify(username, entered_otp, request.remote_addr)
+        if status == otp_service.THROTTLED:
+            return jsonify({"success": False, "message": "Too many attempts. Please try again later."}), 429
+        if status == otp_service.EXPIRED:
+            return jsonify({"success": False, "message": "OTP expired. Please sign in again."}), 401
+        if status == otp_service.LOCKED:
+            return jsonify({"success": False, "message": "Too many incorrect attempts. Please sign in again."}), 401
+
+        if status == otp_service.VALID:
             user = User.query.filter_by(username=username).first()
             if user:
                 session["user_id"] = user.id
@@ -29,9 +33,11 @@ def verify_otp():
                 session.permanent = True  
 
                 auth_token = secrets.token_hex(16) 
+                identity_cache.invalidate(user.id, user.auth_token)
                 user.auth_token = auth_token  
                 user.is_verified = True 
                 db.session.commit()
+                identity_cache.remember(user)
 
                 return jsonify({
                     "success": True,
@@ -0,0 +1,16 @@
+from .job_search import ensure_job_search_index, init_job_search_index, index_job, index_job_rows, unindex_job, search_job_ids, build_like_filter, fts_available
+from .cache import LRUCache, Generation
+from .response_cache import jobs_generation, cached_json_response
+from .identity_cache import identity_cache, UserRecord
+from .otp import otp_service, OtpService, SqlOtpService
+from .mail_outbox import mail_outbox
+from .passwords import password_hasher, HashingBusy
+from .current_user import current_user, current_profile, signin_required, role_required
+from .job_ranker import rank_jobs, match_reason
+from .ranking_cache import ranking_cache, profile_fingerprint, MATCH_PROFILE_FIELDS
+from .llm_ranker import sharded_ranker, ShardedRanker, GeminiClient
+from .job_vectors import job_vectors
+from .chat_context import build_chat_context, minimal_chat_context
+from .job_snapshot import job_snapshot
+from .tag_stream import TagStreamParser
+from .chat_broker import chat_broker, chat_writer
@@ -0,0 +1,156 @@
+import atexit
+import threading
+import time
+from collections import OrderedDict, deque
+from sqlalchemy import insert
+from medjobhub import app, db
+from medjobhub.models import ChatMessage
+
+
+class Room:
+    def __init__(self, buffer_size):
+        self.messages = deque(maxlen=buffer_size)  # (seq, message dict)
+        self.seq = 0
+        self.waiters = 0
+
+
+#In-process pub/sub for chat rooms. Each room keeps its last CHAT_ROOM_BUFFER messages in a
+#ring buffer numbered by a per-room sequence; listeners wait on one shared Condition and read
+#everything after the last sequence they saw. Idle rooms beyond CHAT_MAX_ROOMS are dropped.
+class ChatBroker:
+    def __init__(self, buffer_size, max_rooms):
+        self.buffer_size = buffer_size
+        self.max_rooms = max_rooms
+        self._rooms = OrderedDict()
+        self._condition = threading.Condition()
+
+    def _room(self, name):
+        room = self._rooms.get(name)
+        if room is None:
+            room = self._rooms[name] = Room(self.buffer_size)
+            if len(self._rooms) > self.max_rooms:
+                # Least recently used room nobody is listening to
+                idle = next((key for key, other in self._rooms.items() if not other.waiters), None)
+                if idle is not None and idle != name:
+                    del self._rooms[idle]
+        self._rooms.move_to_end(name)
+        return room
+
+    def publish(self, name, message):
+        with self._condition:
+            room = self._room(name)
+            room.seq += 1
+            room.messages.append((room.seq, dict(message, seq=room.seq)))
+            self._condition.notify_all()
+            return room.seq
+
+    def current_seq(self, name):
+        with self._condition:
+            room = self._rooms.get(name)
+            return room.seq if room else 0
+
+    #Messages after `after`, waiting up to timeout seconds for the first one. Returns
+    #(messages, missed); missed is True when the ring buffer no longer holds everything
+    #after `after` and the client should reload history. An `after` beyond the room's
+    #sequence comes from before a restart or eviction reset it, so that is missed too.
+    def wait(self, name, after, timeout):
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            room = self._room(name)
+            if after > room.seq:
+                return [], True
+            room.waiters += 1
+            try:
+                while room.seq <= after:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return [], False
+                    self._condition.wait(remaining)
+                messages = [message for seq, message in room.messages if seq > after]
+                missed = after < room.seq - len(room.messages)
+                return messages, missed
+            finally:
+                room.waiters -= 1
+
+
+#Write-behind queue for chat messages: sends return once the message is published, and a
+#background thread inserts the backlog in batches every CHAT_WRITE_INTERVAL seconds (or as
+#soon as CHAT_WRITE_BATCH rows are waiting). History reads call flush() first. A failed batch
+#is retried; after CHAT_WRITE_MAX_ATTEMPTS failures in a row it is written row by row and
+#the rows that still fail are logged and dropped, so one bad row cannot block the queue.
+class ChatWriter:
+    def __init__(self, batch_size, interval, max_attempts):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self._failures = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def enqueue(self, row):
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="chat-writer", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                self._insert(batch)
+                self._failures = 0
+            except Exception:
+                self._failures += 1
+                if self._failures < self.max_attempts:
+                    # Put the batch back in order; the next flush retries it
+                    with self._lock:
+                        self._pending[:0] = batch
+                    raise
+                self._failures = 0
+                self._insert_each(batch)
+
+    def _insert(self, rows):
+        with app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(insert(ChatMessage), rows)
+
+    def _insert_each(self, batch):
+        for row in batch:
+            try:
+                self._insert([row])
+            except Exception as e:
+                app.logger.error("[CHAT] dropping message %s -> %s in %s at %s: %s", row.get('sender_id'),
+                                 row.get('receiver_id'), row.get('room'), row.get('timestamp'), e)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                app.logger.exception("[CHAT] write-behind flush failed: %s", e)
+
+
+chat_broker = ChatBroker(app.config['CHAT_ROOM_BUFFER'], app.config['CHAT_MAX_ROOMS'])
+chat_writer = ChatWriter(app.config['CHAT_WRITE_BATCH'], app.config['CHAT_WRITE_INTERVAL'],
+                         app.config['CHAT_WRITE_MAX_ATTEMPTS'])
+
+
+#Messages still queued at interpreter exit are written before the process goes away
+@atexit.register
+def flush_chat_writer():
+    try:
+        chat_writer.flush()
+    except Exception:
+        app.logger.exception("[CHAT] final flush failed")
@@ -0,0 +1,122 @@
+import json
+from sqlalchemy import func
+from medjobhub import app, db
+from medjobhub.models import Job, JobApplication
+from .job_ranker import tokenize
+from .job_vectors import job_vectors, hash_vector, profile_tokens
+from .job_snapshot import job_snapshot
+
+# Compact projections that go into the chatbot prompt (jobs come from the job snapshot)
+CHAT_APPLICATION_FIELDS = ("id", "job_id", "applicant_name", "applied_on", "expected_salary", "application_status")
+CHAT_PROFILE_FIELDS = ("first_name", "last_name", "role", "company_name", "specialization", "skills",
+                       "certifications", "education", "work_experience", "availability")
+
+# Rough prompt-size accounting: ~4 characters per token for English/JSON text
+CHARS_PER_TOKEN = 4
+# Recent applications scored for relevance before the budget is applied
+APPLICATION_SCAN_LIMIT = 200
+
+
+def compact(value):
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def without_empty(values):
+    return {key: value for key, value in values.items() if value not in (None, "", [])}
+
+
+#Jobs nearest the message (and, more weakly, the profile) in the job vector index. When the
+#message names a location, jobs there come first, nearest first, then the newest others there.
+def relevant_job_ids(snapshot, message, profile, limit):
+    message_tokens = tokenize(message)
+    vector = hash_vector(message_tokens * 2 + profile_tokens(profile), job_vectors.dim)
+    nearest = [job_id for job_id, _ in job_vectors.top_k(vector, limit * 4)] if vector.any() else []
+
+    named = [location for location in snapshot.by_location
+             if message_tokens and set(tokenize(location)) <= set(message_tokens)]
+    if named:
+        local = [job_id for location in named for job_id in snapshot.by_location[location]]
+        local_ids = set(local)
+        ids = [job_id for job_id in nearest if job_id in local_ids]
+        seen = set(ids)
+        ids += sorted((job_id for job_id in local if job_id not in seen), reverse=True)
+    else:
+        ids = [job_id for job_id in nearest if job_id in snapshot.lines]
+    return (ids or snapshot.ids)[:limit]
+
+
+#The user's applications (employers: applications to their jobs), most relevant to the
+#message first, then newest; returns (applications, total)
+def relevant_applications(user, message):
+    query = db.session.query(JobApplication, Job.title).join(Job, JobApplication.job_id == Job.id)
+    if user.role == "employer":
+        query = query.filter(Job.posted_by == user.id)
+    else:
+        query = query.filter(JobApplication.user_id == user.id)
+    total = query.with_entities(func.count(JobApplication.id)).scalar()
+    rows = query.options(*JobApplication.to_dict_options(CHAT_APPLICATION_FIELDS)).order_by(JobApplication.id.desc()).limit(APPLICATION_SCAN_LIMIT).all()
+
+    message_tokens = set(tokenize(message))
+    applications = []
+    for application, job_title in rows:
+        values = without_empty(dict(application.to_dict(CHAT_APPLICATION_FIELDS), job_title=job_title))
+        overlap = len(message_tokens & set(tokenize(" ".join(str(value) for value in values.values()))))
+        applications.append((-overlap, values))
+    applications.sort(key=lambda item: item[0])
+    return [values for _, values in applications], total
+
+
+#Take serialized lines until the character budget runs out; returns (lines, shown)
+def fit_lines(candidates, budget_chars):
+    lines, used = [], 0
+    for line in candidates:
+        if used + len(line) + 1 > budget_chars:
+            break
+        lines.append(line)
+        used += len(line) + 1
+    return lines, len(lines)
+
+
+#Prompt context for one chat message: profile, board summary, the most relevant jobs and
+#applications as compact JSON lines, cut to CHAT_CONTEXT_TOKEN_BUDGET. stats records how
+#much of each section made it in.
+def build_chat_context(user, profile, message):
+    config = app.config
+    budget = config['CHAT_CONTEXT_TOKEN_BUDGET'] * CHARS_PER_TOKEN
+
+    profile_text = compact(without_empty({field: profile.get(field) for field in CHAT_PROFILE_FIELDS}))
+    snapshot = job_snapshot.get()
+    budget -= len(profile_text) + len(snapshot.summary_text)
+
+    job_ids = relevant_job_ids(snapshot, message, profile, config['CHAT_CONTEXT_MAX_JOBS'])
+    jobs = [snapshot.lines[job_id] for job_id in job_ids]
+    applications, applications_total = relevant_applications(user, message)
+
+    # Applications are the user's own data: they get first claim on up to half the budget
+    application_lines, applications_shown = fit_lines(map(compact, applications), max(0, budget // 2))
+    budget -= sum(len(line) + 1 for line in application_lines)
+    job_lines, jobs_shown = fit_lines(jobs, max(0, budget))
+
+    stats = {
+        "jobs_shown": jobs_shown, "jobs_total": snapshot.summary["total_jobs"],
+        "applications_shown": applications_shown, "applications_total": applications_total,
+    }
+    stats["truncated"] = jobs_shown < len(jobs) or applications_shown < applications_total
+    return {
+        "profile": profile_text,
+        "summary": snapshot.summary_text,
+        "jobs": "\n".join(job_lines),
+        "applications": "\n".join(application_lines),
+        "stats": stats,
+    }
+
+
+#Stand-in when build_chat_context fails: the profile only, so the chat still answers
+def minimal_chat_context(profile):
+    return {
+        "profile": compact(without_empty({field: profile.get(field) for field in CHAT_PROFILE_FIELDS})),
+        "summary": "Job board data is unavailable right now.",
+        "jobs": "",
+        "applications": "",
+        "stats": {"jobs_shown": 0, "jobs_total": 0, "applications_shown": 0, "applications_total": 0, "truncated": False},
+    }
@@ -0,0 +1,48 @@
+from functools import wraps
+from flask import g, session, jsonify
+from medjobhub import db
+from medjobhub.models import User, UserProfile
+
+
+#The signed-in User and their UserProfile, fetched together in one joined query the first
+#time a request asks for either and memoized on flask.g for the rest of the request
+def load_current_user():
+    if 'current_user' not in g:
+        user_id = session.get('user_id')
+        row = db.session.query(User, UserProfile).outerjoin(
+            UserProfile, UserProfile.user_id == User.id
+        ).filter(User.id == user_id).first() if user_id is not None else None
+        g.current_user, g.current_profile = row if row else (None, None)
+    return g.current_user
+
+
+def current_user():
+    return load_current_user()
+
+
+def current_profile():
+    load_current_user()
+    return g.current_profile
+
+
+#View guards: they only read the session, so rejected requests never touch the database
+def signin_required(message="Please sign in to continue"):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if 'user_id' not in session:
+                return jsonify({"success": False, "message": message})
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def role_required(role, message="Unauthorized access"):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if 'user_id' not in session or session.get('role') != role:
+                return jsonify({"success": False, "message": message})
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,57 @@
+from collections import namedtuple
+from medjobhub import app, db
+from medjobhub.models import User
+from .cache import LRUCache
+
+# The user columns the request paths need, detached from the ORM session
+UserRecord = namedtuple('UserRecord', 'id username email phone role company_name resume auth_token')
+
+
+def user_record(user):
+    return UserRecord(user.id, user.username, user.email, user.phone, user.role,
+                      user.company_name, user.resume, user.auth_token)
+
+
+#auth token -> user and user id -> user lookups served from memory for IDENTITY_CACHE_TTL seconds.
+#Routes that rotate or clear a token, or edit these columns, must call invalidate(). The cache is
+#per process and invalidate() only reaches this one, so a token hit is still checked against
+#users.auth_token: a token revoked through another worker is refused at once.
+class IdentityCache:
+    def __init__(self, maxsize, ttl):
+        self._by_token = LRUCache(maxsize, ttl=ttl)
+        self._by_id = LRUCache(maxsize, ttl=ttl)
+
+    def remember(self, user):
+        record = user_record(user)
+        self._by_id.set(record.id, record)
+        if record.auth_token:
+            self._by_token.set(record.auth_token, record)
+        return record
+
+    def by_token(self, auth_token):
+        record = self._by_token.get(auth_token)
+        if record is not None:
+            # Primary-key lookup of one column; the rest of the record stays cached
+            current = db.session.query(User.auth_token).filter(User.id == record.id).scalar()
+            if current == auth_token:
+                return record
+            self.invalidate(record.id, auth_token)
+            return None
+        user = User.query.filter_by(auth_token=auth_token).first()
+        return self.remember(user) if user else None
+
+    def by_id(self, user_id):
+        record = self._by_id.get(user_id)
+        if record is None:
+            user = User.query.get(user_id)
+            record = self.remember(user) if user else None
+        return record
+
+    def invalidate(self, user_id=None, auth_token=None):
+        record = self._by_id.pop(user_id) if user_id is not None else None
+        for token in (auth_token, record.auth_token if record else None):
+            if token:
+                self._by_token.pop(token)
+
+
+identity_cache = IdentityCache(app.config['IDENTITY_CACHE_SIZE'], app.config['IDENTITY_CACHE_TTL'])
@@ -0,0 +1,93 @@
+import re
+import numpy as np
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Profile fields the pre-ranker matches against job text, with per-field term weights
+PROFILE_FIELD_WEIGHTS = {"skills": 1.0, "specialization": 1.5, "certifications": 0.75}
+# Job fields searched; title and specialization count more than body text
+JOB_FIELD_WEIGHTS = {"title": 3, "specialization": 2, "required_qualifications": 1,
+                     "description": 1, "required_experience": 1}
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset("""a an and are as at be by for from in is of on or the to with
+    we our you your will this that have has job role work""".split())
+REASON_TERMS = 5
+
+
+def tokenize(text):
+    if not text:
+        return []
+    if not isinstance(text, str):
+        text = " ".join(map(str, text)) if isinstance(text, (list, tuple)) else str(text)
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+#Query terms from the profile: term -> weight (repeated terms add up)
+def profile_terms(profile):
+    terms = {}
+    for field, weight in PROFILE_FIELD_WEIGHTS.items():
+        for token in tokenize(profile.get(field)):
+            terms[token] = terms.get(token, 0.0) + weight
+    return terms
+
+
+def job_tokens(job):
+    tokens = []
+    for field, repeat in JOB_FIELD_WEIGHTS.items():
+        tokens.extend(tokenize(job.get(field)) * repeat)
+    return tokens
+
+
+#BM25 over (jobs x profile terms) in one batch. Only the profile's terms become columns, so
+#the matrix stays narrow however large the job vocabulary is.
+#Returns [(index into jobs, score 0-100, matched terms)] best first, at most top_k entries.
+def rank_jobs(profile, jobs, top_k=None):
+    terms = profile_terms(profile)
+    if not jobs:
+        return []
+    n = len(jobs)
+    if not terms:
+        return [(i, 0, []) for i in range(n if top_k is None else min(top_k, n))]
+
+    vocabulary = list(terms)
+    column = {term: j for j, term in enumerate(vocabulary)}
+    counts = np.zeros((n, len(vocabulary)), dtype=np.float32)
+    lengths = np.empty(n, dtype=np.float32)
+    for i, job in enumerate(jobs):
+        tokens = job_tokens(job)
+        lengths[i] = len(tokens)
+        for token in tokens:
+            j = column.get(token)
+            if j is not None:
+                counts[i, j] += 1
+
+    df = np.count_nonzero(counts, axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+    query_weights = idf * np.fromiter(terms.values(), dtype=np.float32, count=len(terms))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(float(lengths.mean()), 1.0))
+    contributions = counts * (BM25_K1 + 1) / (counts + norm[:, None]) * query_weights
+    scores = contributions.sum(axis=1)
+
+    k = n if top_k is None else max(0, min(top_k, n))
+    if k == 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+    top = top[np.lexsort((top, -scores[top]))]
+
+    # Scores are relative to the best match in this batch
+    best = float(scores[top[0]]) or 1.0
+    ranking = []
+    for i in top:
+        matched = np.flatnonzero(contributions[i])
+        matched = matched[np.argsort(-contributions[i, matched])][:REASON_TERMS]
+        ranking.append((int(i), int(round(100 * float(scores[i]) / best)), [vocabulary[j] for j in matched]))
+    return ranking
+
+
+def match_reason(matched_terms):
+    if not matched_terms:
+        return "No overlap with the profile's skills, specialization or certifications."
+    return "Matched on: " + ", ".join(matched_terms)
@@ -0,0 +1,125 @@
+import re
+from html import escape
+from sqlalchemy import text, and_, or_, false
+from medjobhub import app, db
+from medjobhub.models import Job
+
+# Standalone FTS5 table keyed by the job id (rowid), kept in sync from the job routes.
+FTS_TABLE = 'jobs_fts'
+FTS_COLUMNS = ['title', 'description', 'specialization', 'required_qualifications', 'benefits']
+
+# bm25() weights, in FTS_COLUMNS order: a title hit counts far more than a benefits hit
+BM25_WEIGHTS = (10.0, 2.0, 5.0, 3.0, 1.0)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+#snippet() wraps hits in these markers; the job text is escaped before they become <b> tags
+HIT_START, HIT_END = "\x02", "\x03"
+
+
+def fts_available():
+    return db.engine.dialect.name == 'sqlite'
+
+
+_index_ready = False
+
+
+def ensure_job_search_index():
+    global _index_ready
+    if _index_ready or not fts_available():
+        return
+    db.session.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{', '.join(FTS_COLUMNS)}, tokenize='porter unicode61')"
+    ))
+    indexed = db.session.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+    if not indexed:
+        rebuild_job_search_index()
+    db.session.commit()
+    _index_ready = True
+
+
+#Workers that never ran app.py build the index once at startup, before their first write to it
+def init_job_search_index(app):
+    with app.app_context():
+        try:
+            if db.inspect(db.engine).has_table('jobs'):
+                ensure_job_search_index()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning("Job search index not ready: %s", e)
+
+
+def rebuild_job_search_index():
+    db.session.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    db.session.execute(text(
+        f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(FTS_COLUMNS)}) "
+        f"SELECT id, {', '.join(FTS_COLUMNS)} FROM jobs"
+    ))
+
+
+#Called inside the caller's transaction so the index commits (or rolls back) with the job
+def index_job(job):
+    index_job_rows([{"id": job.id, **{column: getattr(job, column) for column in FTS_COLUMNS}}])
+
+
+def index_job_rows(rows):
+    if not fts_available() or not rows:
+        return
+    params = [{"id": row["id"], **{column: row.get(column) for column in FTS_COLUMNS}} for row in rows]
+    db.session.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), [{"id": p["id"]} for p in params])
+    db.session.execute(text(
+        f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(FTS_COLUMNS)}) "
+        f"VALUES (:id, {', '.join(':' + column for column in FTS_COLUMNS)})"
+    ), params)
+
+
+def unindex_job(job_id):
+    if not fts_available():
+        return
+    db.session.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": job_id})
+
+
+#Turns free text into an FTS5 query: every word quoted (no operator injection) and prefix-matched
+def build_match_query(query):
+    terms = TOKEN_RE.findall(query or '')
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+#The same search as a WHERE clause for databases without FTS5: every word must occur in one of
+#FTS_COLUMNS, as a substring. LIKE wildcards in the words are escaped so they match literally.
+def build_like_filter(query):
+    terms = TOKEN_RE.findall(query or '')
+    if not terms:
+        return false()
+    patterns = ['%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%' for term in terms]
+    return and_(*(
+        or_(*(getattr(Job, column).ilike(pattern, escape='\\') for column in FTS_COLUMNS))
+        for pattern in patterns
+    ))
+
+
+def highlight(snippet):
+    if snippet is None:
+        return None
+    return escape(snippet, quote=False).replace(HIT_START, "<b>").replace(HIT_END, "</b>")
+
+
+#Returns [(job_id, rank, snippet)] best match first, plus the total number of matches;
+#snippets are escaped HTML with the matched terms in <b>
+def search_job_ids(query, limit, offset):
+    match = build_match_query(query)
+    if not match:
+        return [], 0
+
+    weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+    rows = db.session.execute(text(
+        f"SELECT rowid, bm25({FTS_TABLE}, {weights}) AS rank, "
+        f"snippet({FTS_TABLE}, -1, :hit_start, :hit_end, '…', 16) AS snippet "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match "
+        f"ORDER BY rank LIMIT :limit OFFSET :offset"
+    ), {"match": match, "limit": limit, "offset": offset, "hit_start": HIT_START, "hit_end": HIT_END}).all()
+    total = db.session.execute(text(
+        f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+    ), {"match": match}).scalar()
+    return [(row.rowid, row.rank, highlight(row.snippet)) for row in rows], total
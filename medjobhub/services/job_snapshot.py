@@ -0,0 +1,76 @@
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from medjobhub import app, db
+from medjobhub.models import Job
+from .response_cache import jobs_generation
+
+# Columns serialized for the chatbot; one compact JSON line per job
+SNAPSHOT_JOB_FIELDS = ("id", "title", "company", "location", "salary", "employment_type",
+                       "specialization", "required_experience", "shift_timing")
+SUMMARY_FACETS = 8
+
+
+#Immutable view of the job catalogue as the chatbot sees it, built from one column query
+class JobSnapshot:
+    def __init__(self, generation, rows):
+        self.generation = generation
+        self.built_at = time.monotonic()
+        self.lines = {}
+        self.ids = []  # newest first
+        self.by_location = {}
+        specializations = Counter()
+        for row in rows:
+            values = {field: getattr(row, field) for field in SNAPSHOT_JOB_FIELDS}
+            values = {field: value.isoformat() if isinstance(value, datetime) else value
+                      for field, value in values.items() if value not in (None, "")}
+            self.lines[row.id] = json.dumps(values, separators=(",", ":"))
+            self.ids.append(row.id)
+            if row.location:
+                self.by_location.setdefault(row.location, []).append(row.id)
+            if row.specialization:
+                specializations[row.specialization] += 1
+        self.summary = {
+            "total_jobs": len(self.ids),
+            "jobs_by_location": dict(Counter({location: len(ids) for location, ids in self.by_location.items()}).most_common(SUMMARY_FACETS)),
+            "jobs_by_specialization": dict(specializations.most_common(SUMMARY_FACETS)),
+        }
+        self.summary_text = json.dumps(self.summary, separators=(",", ":"))
+
+
+#Serves the current JobSnapshot, rebuilding it on first use after jobs_generation moves
+#(add_job, /add_jobs_bulk, delete_job) or after CHAT_SNAPSHOT_MAX_AGE seconds, which bounds
+#staleness from writes made by other worker processes. One thread rebuilds while the
+#others keep reading the previous snapshot.
+class JobSnapshotCache:
+    def __init__(self, max_age):
+        self.max_age = max_age
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def fresh(self, snapshot):
+        return (snapshot is not None and snapshot.generation == jobs_generation.value
+                and time.monotonic() - snapshot.built_at < self.max_age)
+
+    def get(self):
+        snapshot = self._snapshot
+        if self.fresh(snapshot):
+            return snapshot
+        if snapshot is not None and not self._lock.acquire(blocking=False):
+            return snapshot
+        if snapshot is None:
+            self._lock.acquire()
+        try:
+            if not self.fresh(self._snapshot):
+                generation = jobs_generation.value
+                columns = [getattr(Job, field) for field in SNAPSHOT_JOB_FIELDS]
+                rows = db.session.execute(db.select(*columns).order_by(Job.id.desc())).all()
+                self._snapshot = JobSnapshot(generation, rows)
+            return self._snapshot
+        finally:
+            self._lock.release()
+
+
+job_snapshot = JobSnapshotCache(app.config['CHAT_SNAPSHOT_MAX_AGE'])
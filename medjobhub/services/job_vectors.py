@@ -0,0 +1,226 @@
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+import numpy as np
+from medjobhub import app, db
+from .job_ranker import tokenize, job_tokens, PROFILE_FIELD_WEIGHTS
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so run a single writer process there
+    fcntl = None
+
+# Job fields read when (re)building vectors from the jobs table
+VECTOR_JOB_FIELDS = ('title', 'specialization', 'required_qualifications', 'description', 'required_experience')
+MIN_CAPACITY = 1024
+
+
+#Hashing-trick bag of words: each token lands in one of `dim` signed buckets (crc32, so the
+#mapping is stable across processes), counts are log-damped and the vector is L2-normalized
+def hash_vector(tokens, dim):
+    vector = np.zeros(dim, dtype=np.float32)
+    if not tokens:
+        return vector
+    hashes = np.fromiter((zlib.crc32(token.encode()) for token in tokens), dtype=np.uint32, count=len(tokens))
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+    vector += np.bincount(hashes % dim, weights=signs, minlength=dim).astype(np.float32)
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def profile_tokens(profile):
+    tokens = []
+    for field, weight in PROFILE_FIELD_WEIGHTS.items():
+        tokens.extend(tokenize(profile.get(field)) * max(1, int(round(weight * 2))))
+    return tokens
+
+
+#Job vectors in a float32 matrix memory-mapped from instance/job_vectors.f32, one row per
+#slot, with the owning job id per slot in instance/job_vectors.ids (0 = free slot). Adds
+#and deletes touch one row; the files only grow, doubling when full. Every process shares
+#the files: writes hold an flock on instance/job_vectors.lock and bump a counter in
+#instance/job_vectors.gen; a process re-reads the slot table whenever the counter has
+#moved since it last did, so two workers never hand out the same free slot and each sees
+#the jobs the others added or removed.
+class JobVectorIndex:
+    def __init__(self, directory, dim):
+        self.dim = dim
+        self.vectors_path = os.path.join(directory, 'job_vectors.f32')
+        self.ids_path = os.path.join(directory, 'job_vectors.ids')
+        self.lock_path = os.path.join(directory, 'job_vectors.lock')
+        self.generation_path = os.path.join(directory, 'job_vectors.gen')
+        self._lock = threading.RLock()
+        self._vectors = None
+        self._ids = None
+        self._slots = {}
+        self._free = []
+        self._size = 0
+        self._generation = None
+        self._seen = None
+
+    def job_vector(self, job):
+        return hash_vector(job_tokens(job), self.dim)
+
+    def profile_vector(self, profile):
+        return hash_vector(profile_tokens(profile), self.dim)
+
+    def _open(self):
+        capacity = os.path.getsize(self.ids_path) // 8
+        if os.path.getsize(self.vectors_path) != capacity * self.dim * 4:
+            raise ValueError("job vector files disagree on capacity")
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+        self._ids = np.memmap(self.ids_path, dtype=np.int64, mode='r+', shape=(capacity,))
+        used = np.flatnonzero(self._ids)
+        self._slots = {int(self._ids[slot]): int(slot) for slot in used}
+        self._size = int(used[-1]) + 1 if len(used) else 0
+        self._free = np.flatnonzero(self._ids[:self._size] == 0).tolist()
+        self._seen = int(self._generation[0])
+
+    #Cross-process writer lock; not re-entrant, so take it once per public call
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        with open(self.lock_path, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    #Under the file lock: map the shared write counter, creating it on first use
+    def _map_generation(self):
+        if not os.path.exists(self.generation_path) or os.path.getsize(self.generation_path) != 8:
+            np.zeros(1, dtype=np.int64).tofile(self.generation_path)
+        self._generation = np.memmap(self.generation_path, dtype=np.int64, mode='r+', shape=(1,))
+
+    #Under the file lock, after a write: tell the other processes to re-read the slot table
+    def _bump(self):
+        self._generation[0] += 1
+        self._generation.flush()
+        self._seen = int(self._generation[0])
+
+    def _current(self):
+        return (self._ids is not None and int(self._generation[0]) == self._seen
+                and os.path.exists(self.generation_path) and os.path.exists(self.ids_path))
+
+    #Under the file lock: re-read the files if another process wrote since we last did,
+    #building them from the jobs table if they are missing or inconsistent
+    def _reload(self):
+        if self._generation is None or not os.path.exists(self.generation_path):
+            self._map_generation()
+        if not (os.path.exists(self.ids_path) and os.path.exists(self.vectors_path)):
+            self._rebuild()
+            return
+        if self._current():
+            return
+        try:
+            self._open()
+        except ValueError:
+            self._rebuild()
+
+    #For readers: a memory read of the counter when nothing changed, else a locked reload
+    def _ensure(self):
+        if self._generation is not None and self._current():
+            return
+        with self._file_lock():
+            self._reload()
+
+    def _resize(self, capacity):
+        for path, width in ((self.vectors_path, self.dim * 4), (self.ids_path, 8)):
+            with open(path, 'ab') as f:
+                f.truncate(capacity * width)
+        self._open()
+
+    def rebuild(self):
+        with self._lock, self._file_lock():
+            self._rebuild()
+
+    def _rebuild(self):
+        from medjobhub.models import Job
+        if self._generation is None:
+            self._map_generation()
+        columns = [Job.id] + [getattr(Job, field) for field in VECTOR_JOB_FIELDS]
+        rows = db.session.execute(db.select(*columns).order_by(Job.id)).all()
+        capacity = max(MIN_CAPACITY, 2 * len(rows))
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        ids = np.zeros(capacity, dtype=np.int64)
+        for slot, row in enumerate(rows):
+            ids[slot] = row.id
+            vectors[slot] = self.job_vector(row._mapping)
+        for path, array in ((self.vectors_path, vectors), (self.ids_path, ids)):
+            with open(path + '.tmp', 'wb') as f:
+                array.tofile(f)
+            os.replace(path + '.tmp', path)
+        self._open()
+        self._bump()
+
+    #rows: dicts (or Job objects) carrying an id and the job text fields
+    def add(self, rows):
+        with self._lock, self._file_lock():
+            self._reload()
+            for row in rows:
+                job = row if isinstance(row, dict) else {field: getattr(row, field) for field in ('id',) + VECTOR_JOB_FIELDS}
+                slot = self._slots.get(job['id'])
+                if slot is None:
+                    if self._free:
+                        slot = self._free.pop()
+                    else:
+                        if self._size == len(self._ids):
+                            self._resize(max(MIN_CAPACITY, 2 * len(self._ids)))
+                        slot = self._size
+                        self._size += 1
+                    self._slots[job['id']] = slot
+                self._vectors[slot] = self.job_vector(job)
+                self._ids[slot] = job['id']
+            self._vectors.flush()
+            self._ids.flush()
+            self._bump()
+
+    def remove(self, job_id):
+        with self._lock, self._file_lock():
+            self._reload()
+            slot = self._slots.pop(job_id, None)
+            if slot is None:
+                return
+            self._ids[slot] = 0
+            self._vectors[slot] = 0
+            self._free.append(slot)
+            self._vectors.flush()
+            self._ids.flush()
+            self._bump()
+
+    def vector(self, job_id):
+        with self._lock:
+            self._ensure()
+            slot = self._slots.get(job_id)
+            return None if slot is None else np.array(self._vectors[slot])
+
+    #[(job id, cosine similarity)] best first: one matrix-vector product, then argpartition.
+    #`among` limits the candidates to those job ids.
+    def top_k(self, vector, k, exclude=(), among=None):
+        with self._lock:
+            self._ensure()
+            vectors, ids = self._vectors[:self._size], self._ids[:self._size]
+            scores = vectors @ vector
+            scores[ids == 0] = -np.inf
+            if among is not None:
+                allowed = np.zeros(len(scores), dtype=bool)
+                allowed[[self._slots[job_id] for job_id in among if job_id in self._slots]] = True
+                scores[~allowed] = -np.inf
+            for job_id in exclude:
+                slot = self._slots.get(job_id)
+                if slot is not None:
+                    scores[slot] = -np.inf
+        k = min(k, int(np.count_nonzero(np.isfinite(scores))))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(ids[slot]), float(scores[slot])) for slot in top]
+
+    def similar(self, job_id, k):
+        vector = self.vector(job_id)
+        return None if vector is None else self.top_k(vector, k, exclude=(job_id,))
+
+
+job_vectors = JobVectorIndex(app.instance_path, app.config['JOB_VECTOR_DIM'])
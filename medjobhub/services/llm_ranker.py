@@ -0,0 +1,98 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from medjobhub import app
+
+
+#Default model client. Anything with generate(prompt) -> str can stand in for it.
+class GeminiClient:
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def generate(self, prompt):
+        import google.generativeai as genai
+        return genai.GenerativeModel(self.model_name).generate_content(prompt).text
+
+
+#Pull {"ranked_jobs": [...]} out of a model reply; entries for ids outside the shard are
+#dropped and scores are clipped to the 0-100 range the prompt asks for
+def parse_ranked_jobs(text, job_ids):
+    start, end = text.find("{"), text.rfind("}") + 1
+    ranked = json.loads(text[start:end]).get("ranked_jobs", [])
+    entries = {}
+    for entry in ranked:
+        try:
+            job_id = int(entry.get("id"))
+            score = min(100, max(0, int(round(float(entry.get("match_score", 0))))))
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if job_id in job_ids and job_id not in entries:
+            entries[job_id] = {"id": job_id, "match_score": score, "reason": entry.get("reason")}
+    return list(entries.values())
+
+
+#Each shard is scored in its own model call, so a 70 in one shard need not mean a 70 in
+#another. Rescale a shard so its total matches the reference (local) scores of the same jobs:
+#the order inside the shard stays the model's, the level comes from one scale for all shards.
+def calibrate_shard(entries, reference):
+    pairs = [(reference[entry["id"]], entry["match_score"]) for entry in entries if entry["id"] in reference]
+    model_total = sum(model for _, model in pairs)
+    if not model_total:
+        return entries
+    factor = sum(local for local, _ in pairs) / model_total
+    return [dict(entry, match_score=min(100, int(round(entry["match_score"] * factor)))) for entry in entries]
+
+
+#Ranks jobs in shards of shard_size on a shared, bounded thread pool. Shards still running
+#at the deadline are abandoned and their jobs reported back as unscored, so one slow or
+#broken model call costs part of the ranking instead of the whole request.
+class ShardedRanker:
+    def __init__(self, client, shard_size, workers, deadline):
+        self.client = client
+        self.shard_size = max(1, shard_size)
+        self.workers = workers
+        self.deadline = deadline
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="llm-ranker")
+            return self._executor
+
+    def shard(self, build_prompt, jobs):
+        text = self.client.generate(build_prompt(jobs))
+        return parse_ranked_jobs(text, {job["id"] for job in jobs})
+
+    #Returns (model scores best first, ids of jobs left unscored, partial). partial is True
+    #when the deadline cut a shard off; unparsable or failed shards only leave their jobs unscored.
+    #With reference ({job id: score}), every shard is calibrated against it before the merge.
+    def rank(self, build_prompt, jobs, deadline=None, reference=None):
+        deadline = self.deadline if deadline is None else deadline
+        shards = [jobs[i:i + self.shard_size] for i in range(0, len(jobs), self.shard_size)]
+        futures = {self.executor().submit(self.shard, build_prompt, shard): shard for shard in shards}
+        done, not_done = wait(futures, timeout=deadline)
+
+        scored = []
+        for future in not_done:
+            future.cancel()
+        for future in done:
+            try:
+                entries = future.result()
+            except Exception as e:
+                app.logger.warning("Job ranking shard failed: %s", e)
+                continue
+            scored.extend(calibrate_shard(entries, reference) if reference else entries)
+        scored_ids = {entry["id"] for entry in scored}
+        unscored = [job["id"] for job in jobs if job["id"] not in scored_ids]
+        scored.sort(key=lambda entry: entry["match_score"], reverse=True)
+        return scored, unscored, bool(not_done)
+
+
+sharded_ranker = ShardedRanker(
+    GeminiClient("gemini-2.5-flash"),
+    app.config['AI_MATCHER_SHARD_SIZE'],
+    app.config['AI_MATCHER_WORKERS'],
+    app.config['AI_MATCHER_DEADLINE'],
+)
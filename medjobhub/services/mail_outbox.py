@@ -0,0 +1,152 @@
+import json
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from flask_mail import Mail, Message
+from sqlalchemy import and_, insert, or_, select, update
+from medjobhub import app, db
+from medjobhub.models import OutboxMessage
+
+mail = Mail(app)
+
+
+#Persistent outbox for outgoing mail. Routes enqueue a flask_mail.Message and return
+#immediately; worker threads claim due messages in batches, send each batch over one
+#SMTP connection and retry failures with exponential backoff.
+class MailOutbox:
+    def __init__(self, config):
+        self.workers = config['MAIL_OUTBOX_WORKERS']
+        self.batch_size = config['MAIL_OUTBOX_BATCH_SIZE']
+        self.max_attempts = config['MAIL_OUTBOX_MAX_ATTEMPTS']
+        self.backoff = config['MAIL_OUTBOX_BACKOFF']
+        self.poll_interval = config['MAIL_OUTBOX_POLL_INTERVAL']
+        self.claim_timeout = config['MAIL_OUTBOX_CLAIM_TIMEOUT']
+        self._wake = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def enqueue(self, msg):
+        with app.app_context():
+            with db.engine.begin() as conn:
+                message_id = conn.execute(insert(OutboxMessage).values(
+                    subject=msg.subject,
+                    sender=msg.sender if isinstance(msg.sender, str) else "{} <{}>".format(*msg.sender),
+                    recipients=json.dumps(list(msg.recipients)),
+                    body=msg.body,
+                    html=msg.html,
+                    status="pending",
+                    attempts=0,
+                    next_attempt_at=datetime.utcnow(),
+                    created_at=datetime.utcnow(),
+                )).inserted_primary_key[0]
+        self.start()
+        self._wake.set()
+        return message_id
+
+    def status(self, message_id):
+        with app.app_context():
+            with db.engine.connect() as conn:
+                row = conn.execute(select(
+                    OutboxMessage.status, OutboxMessage.attempts, OutboxMessage.last_error, OutboxMessage.sent_at
+                ).where(OutboxMessage.id == message_id)).first()
+        return row._asdict() if row else None
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"mail-outbox-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            try:
+                with app.app_context():
+                    batch = self._claim_batch()
+                    if batch:
+                        self._deliver(batch)
+                        continue
+            except Exception as e:
+                app.logger.exception("[OUTBOX] worker error: %s", e)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    #Due pending messages, plus "sending" ones whose claim outlived MAIL_OUTBOX_CLAIM_TIMEOUT
+    #(their worker died mid-batch). Live claims in other processes are left alone.
+    def _claimable(self, now):
+        return or_(
+            and_(OutboxMessage.status == "pending", OutboxMessage.next_attempt_at <= now),
+            and_(OutboxMessage.status == "sending", or_(
+                OutboxMessage.claimed_at.is_(None),
+                OutboxMessage.claimed_at <= now - timedelta(seconds=self.claim_timeout),
+            )),
+        )
+
+    def _claim_batch(self):
+        now = datetime.utcnow()
+        with db.engine.begin() as conn:
+            ids = conn.execute(select(OutboxMessage.id).where(
+                self._claimable(now)
+            ).order_by(OutboxMessage.id).limit(self.batch_size)).scalars().all()
+            claimed = [
+                message_id for message_id in ids
+                if conn.execute(update(OutboxMessage).where(
+                    OutboxMessage.id == message_id, self._claimable(now)
+                ).values(status="sending", claimed_at=now)).rowcount
+            ]
+            if not claimed:
+                return []
+            return conn.execute(select(OutboxMessage).where(OutboxMessage.id.in_(claimed))).all()
+
+    def _deliver(self, batch):
+        pending = list(batch)
+        try:
+            with mail.connect() as connection:
+                while pending:
+                    row = pending[0]
+                    try:
+                        connection.send(Message(
+                            row.subject, sender=row.sender, recipients=json.loads(row.recipients),
+                            body=row.body, html=row.html
+                        ))
+                    except Exception as e:
+                        # Socket-level errors end the batch; SMTP errors only fail this message
+                        if isinstance(e, smtplib.SMTPServerDisconnected) or (
+                                isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)):
+                            raise
+                        self._mark_failed_attempt(row, e)
+                    else:
+                        # Delivered: a bookkeeping failure must not put it back in the retry tail
+                        try:
+                            self._mark_sent(row)
+                        except Exception:
+                            app.logger.exception("[OUTBOX] message %s sent but not marked sent", row.id)
+                    pending.pop(0)
+        except Exception as e:
+            # Connection-level failure: everything not yet sent in this batch is retried
+            app.logger.warning("[OUTBOX] SMTP connection failed, retrying %d messages: %s", len(pending), e)
+            for item in pending:
+                self._mark_failed_attempt(item, e)
+
+    def _mark_sent(self, row):
+        with db.engine.begin() as conn:
+            conn.execute(update(OutboxMessage).where(OutboxMessage.id == row.id).values(
+                status="sent", attempts=row.attempts + 1, sent_at=datetime.utcnow(), claimed_at=None, last_error=None
+            ))
+
+    def _mark_failed_attempt(self, row, error):
+        attempts = row.attempts + 1
+        status = "failed" if attempts >= self.max_attempts else "pending"
+        delay = timedelta(seconds=self.backoff * 2 ** (attempts - 1))
+        with db.engine.begin() as conn:
+            conn.execute(update(OutboxMessage).where(OutboxMessage.id == row.id).values(
+                status=status, attempts=attempts, claimed_at=None, last_error=str(error)[:1000],
+                next_attempt_at=datetime.utcnow() + delay
+            ))
+        if status == "failed":
+            app.logger.error("[OUTBOX] giving up on message %s after %d attempts: %s", row.id, attempts, error)
+
+
+mail_outbox = MailOutbox(app.config)
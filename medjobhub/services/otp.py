@@ -0,0 +1,248 @@
+import heapq
+import hmac
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from medjobhub import app, db
+from medjobhub.models import OtpCode, RateLimitBucket
+from .cache import LRUCache
+
+UPSERT_DIALECTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+#Classic token bucket per key: `capacity` requests in a burst, refilled at `rate` per second.
+#Keys live in an LRU so idle users/IPs do not accumulate.
+class TokenBucketLimiter:
+    def __init__(self, capacity, rate, maxsize=100000):
+        self.capacity = capacity
+        self.rate = rate
+        self._buckets = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def _tokens(self, key, now):
+        tokens, updated = self._buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def available(self, key):
+        with self._lock:
+            return self._tokens(key, time.monotonic()) >= 1
+
+    def take(self, key):
+        now = time.monotonic()
+        with self._lock:
+            self._buckets.set(key, (self._tokens(key, now) - 1, now))
+
+
+#The same bucket kept in rate_limit_buckets so every worker draws from it. consume() refills
+#and takes a token in one conditional UPDATE; call it inside the caller's transaction.
+class SqlTokenBucketLimiter:
+    def __init__(self, name, capacity, rate):
+        self.name = name
+        self.capacity = capacity
+        self.rate = rate
+
+    def consume(self, conn, key, now):
+        key = f"{self.name}:{key}"
+        insert = UPSERT_DIALECTS[conn.dialect.name]
+        conn.execute(insert(RateLimitBucket).values(key=key, tokens=self.capacity, updated_at=now)
+                     .on_conflict_do_nothing(index_elements=[RateLimitBucket.key]))
+        refilled = RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * self.rate
+        tokens = case((refilled > self.capacity, self.capacity), else_=refilled)
+        return conn.execute(update(RateLimitBucket).where(RateLimitBucket.key == key, tokens >= 1)
+                            .values(tokens=tokens - 1, updated_at=now)).rowcount == 1
+
+    #Buckets idle long enough to be full again are the same as no row
+    def sweep(self, conn, now):
+        conn.execute(delete(RateLimitBucket).where(
+            RateLimitBucket.key.startswith(f"{self.name}:"),
+            RateLimitBucket.updated_at <= now - self.capacity / self.rate,
+        ))
+
+
+class OtpEntry:
+    __slots__ = ('code', 'expires_at', 'sent_at', 'attempts')
+
+    def __init__(self, code, expires_at, sent_at):
+        self.code = code
+        self.expires_at = expires_at
+        self.sent_at = sent_at
+        self.attempts = 0
+
+
+#One pending OTP per username. Expiry is tracked with a min-heap so purging is
+#O(log n) per expired code; verification is a dict lookup plus a constant-time compare.
+#State lives in this process only (OTP_BACKEND=memory): use it with a single worker.
+class OtpService:
+    SENT, PENDING, THROTTLED = 'sent', 'pending', 'throttled'
+    VALID, INVALID, EXPIRED, LOCKED = 'valid', 'invalid', 'expired', 'locked'
+
+    def __init__(self, config):
+        self.ttl = config['OTP_TTL']
+        self.max_attempts = config['OTP_MAX_ATTEMPTS']
+        self.resend_interval = config['OTP_RESEND_INTERVAL']
+        self.send_limits = [
+            ('user', self._limiter('send:user', config['OTP_USER_SEND_BURST'], 1 / config['OTP_USER_SEND_INTERVAL'])),
+            ('ip', self._limiter('send:ip', config['OTP_IP_SEND_BURST'], 1 / config['OTP_IP_SEND_INTERVAL'])),
+        ]
+        self.verify_limits = [
+            ('user', self._limiter('verify:user', config['OTP_USER_VERIFY_BURST'], 1 / config['OTP_USER_VERIFY_INTERVAL'])),
+            ('ip', self._limiter('verify:ip', config['OTP_IP_VERIFY_BURST'], 1 / config['OTP_IP_VERIFY_INTERVAL'])),
+        ]
+        self._entries = {}
+        self._expiry = []
+        self._lock = threading.Lock()
+
+    def _limiter(self, name, capacity, rate):
+        return TokenBucketLimiter(capacity, rate)
+
+    def _purge(self, now):
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, username = heapq.heappop(self._expiry)
+            entry = self._entries.get(username)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[username]
+
+    #Every bucket is checked before any is charged, so a request refused by the IP
+    #limit does not also spend the user's token. Called under self._lock.
+    def _allowed(self, limits, username, ip):
+        keys = {'user': username, 'ip': ip}
+        buckets = [(limiter, keys[kind]) for kind, limiter in limits if keys[kind]]
+        if not all(limiter.available(key) for limiter, key in buckets):
+            return False
+        for limiter, key in buckets:
+            limiter.take(key)
+        return True
+
+    #Returns (status, code); code is only set when a new OTP must be emailed
+    def issue(self, username, ip=None):
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            entry = self._entries.get(username)
+            if entry is not None and now - entry.sent_at < self.resend_interval:
+                return self.PENDING, None
+            if not self._allowed(self.send_limits, username, ip):
+                return self.THROTTLED, None
+
+            code = f"{secrets.randbelow(900000) + 100000}"
+            entry = OtpEntry(code, now + self.ttl, now)
+            self._entries[username] = entry
+            heapq.heappush(self._expiry, (entry.expires_at, username))
+            return self.SENT, code
+
+    def verify(self, username, code, ip=None):
+        now = time.monotonic()
+        with self._lock:
+            if not self._allowed(self.verify_limits, username, ip):
+                return self.THROTTLED
+            self._purge(now)
+            entry = self._entries.get(username)
+            if entry is None:
+                return self.EXPIRED
+
+            #Bytes, since compare_digest rejects non-ASCII str; such input is just a wrong code
+            if hmac.compare_digest(entry.code.encode(), str(code).strip().encode()):
+                del self._entries[username]
+                return self.VALID
+
+            entry.attempts += 1
+            if entry.attempts >= self.max_attempts:
+                del self._entries[username]
+                return self.LOCKED
+            return self.INVALID
+
+    def discard(self, username):
+        with self._lock:
+            self._entries.pop(username, None)
+
+
+class _Refused(Exception):
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+#OtpService over the otp_codes and rate_limit_buckets tables, so a code sent by one worker
+#verifies on any other and the limits hold across all of them. Each call is one transaction
+#that writes before it reads; a refusal raises _Refused to roll back tokens already taken.
+class SqlOtpService(OtpService):
+    def _limiter(self, name, capacity, rate):
+        return SqlTokenBucketLimiter(name, capacity, rate)
+
+    def _consume(self, conn, limits, username, ip):
+        keys = {'user': username, 'ip': ip}
+        now = time.time()
+        for kind, limiter in limits:
+            if keys[kind] and not limiter.consume(conn, keys[kind], now):
+                raise _Refused(self.THROTTLED)
+
+    def issue(self, username, ip=None):
+        now = datetime.utcnow()
+        code = f"{secrets.randbelow(900000) + 100000}"
+        try:
+            with db.engine.begin() as conn:
+                self._consume(conn, self.send_limits, username, ip)
+                entry = conn.execute(select(OtpCode.sent_at, OtpCode.expires_at)
+                                     .where(OtpCode.username == username)).first()
+                if entry is not None and entry.expires_at > now and \
+                        (now - entry.sent_at).total_seconds() < self.resend_interval:
+                    raise _Refused(self.PENDING)
+                values = dict(code=code, sent_at=now, expires_at=now + timedelta(seconds=self.ttl), attempts=0)
+                insert = UPSERT_DIALECTS[conn.dialect.name]
+                conn.execute(insert(OtpCode).values(username=username, **values)
+                             .on_conflict_do_update(index_elements=[OtpCode.username], set_=values))
+                # Housekeeping on the (rare) send path
+                conn.execute(delete(OtpCode).where(OtpCode.expires_at <= now))
+                for _, limiter in self.send_limits + self.verify_limits:
+                    limiter.sweep(conn, time.time())
+        except _Refused as refused:
+            return refused.status, None
+        return self.SENT, code
+
+    def verify(self, username, code, ip=None):
+        now = datetime.utcnow()
+        try:
+            with db.engine.begin() as conn:
+                self._consume(conn, self.verify_limits, username, ip)
+                entry = conn.execute(select(OtpCode.code, OtpCode.expires_at, OtpCode.attempts)
+                                     .where(OtpCode.username == username)).first()
+                if entry is None:
+                    return self.EXPIRED
+                current = (OtpCode.username == username, OtpCode.code == entry.code)
+                if entry.expires_at <= now:
+                    conn.execute(delete(OtpCode).where(*current))
+                    return self.EXPIRED
+
+                #Bytes, since compare_digest rejects non-ASCII str; such input is just a wrong code
+                if hmac.compare_digest(entry.code.encode(), str(code).strip().encode()):
+                    # Single use: only the request that deletes the row gets VALID
+                    if conn.execute(delete(OtpCode).where(*current)).rowcount:
+                        return self.VALID
+                    return self.EXPIRED
+
+                if entry.attempts + 1 >= self.max_attempts:
+                    conn.execute(delete(OtpCode).where(*current))
+                    return self.LOCKED
+                conn.execute(update(OtpCode).where(*current).values(attempts=OtpCode.attempts + 1))
+                return self.INVALID
+        except _Refused as refused:
+            return refused.status
+
+    def discard(self, username):
+        with db.engine.begin() as conn:
+            conn.execute(delete(OtpCode).where(OtpCode.username == username))
+
+
+def make_otp_service(config):
+    backend = config['OTP_BACKEND']
+    if backend == 'sql':
+        return SqlOtpService(config)
+    if backend == 'memory':
+        return OtpService(config)
+    raise ValueError(f"Unknown OTP_BACKEND: {backend}")
+
+
+otp_service = make_otp_service(app.config)
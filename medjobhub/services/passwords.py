@@ -0,0 +1,64 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
+from medjobhub import app
+
+
+class HashingBusy(Exception):
+    #Seconds clients are told to wait (Retry-After) before trying again
+    retry_after = 1
+
+    def __init__(self):
+        super().__init__("Server is busy. Please try again in a moment.")
+
+
+#Runs the password KDF in a bounded process pool so hashing never holds the GIL of the
+#request worker. At most PASSWORD_HASH_MAX_PENDING calls may be queued; beyond that
+#callers get HashingBusy immediately instead of piling up, and a call that outlives
+#PASSWORD_HASH_TIMEOUT also gets HashingBusy (its slot stays taken until the pool
+#finishes it). With 0 workers it runs inline.
+class PasswordHasher:
+    def __init__(self, config):
+        self.method = config['PASSWORD_HASH_METHOD']
+        self.workers = config['PASSWORD_HASH_WORKERS']
+        self.timeout = config['PASSWORD_HASH_TIMEOUT']
+        self._slots = threading.BoundedSemaphore(config['PASSWORD_HASH_MAX_PENDING'])
+        self._executor = None
+        self._lock = threading.Lock()
+        # werkzeug normalises the method (e.g. adds default iterations); compare against that form
+        self._method_prefix = generate_password_hash("", self.method, salt_length=1).split("$", 1)[0]
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            with self._lock:
+                if self._executor is None:
+                    # spawn: forking a threaded server can copy held locks into the children
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingBusy()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        return self._run(check_password_hash, stored_hash, password)
+
+    #True when the stored hash was made with other parameters than PASSWORD_HASH_METHOD
+    def needs_rehash(self, stored_hash):
+        return stored_hash.split("$", 1)[0] != self._method_prefix
+
+
+password_hasher = PasswordHasher(app.config)
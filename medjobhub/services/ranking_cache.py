@@ -0,0 +1,95 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from medjobhub import app, db
+from medjobhub.models import JobMatchScore
+from .cache import LRUCache
+
+# Profile fields that go into the matcher prompt; editing any of them changes the fingerprint
+MATCH_PROFILE_FIELDS = ("skills", "education", "experience", "work_experience", "certifications",
+                        "specialization", "availability")
+# Job fields the model sees; editing any of them changes the job's fingerprint
+MATCH_JOB_FIELDS = ("title", "company", "location", "description", "specialization",
+                    "required_experience", "required_qualifications", "employment_type",
+                    "job_type", "salary", "shift_timing")
+
+
+def fingerprint(values):
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def profile_fingerprint(profile):
+    return fingerprint({field: profile.get(field) for field in MATCH_PROFILE_FIELDS})
+
+
+def job_fingerprint(job):
+    return fingerprint({field: job.get(field) for field in MATCH_JOB_FIELDS})
+
+
+#Per-job Gemini scores keyed by (profile fingerprint, job id, job fingerprint): an in-process
+#LRU in front of the job_match_scores table, both expiring after AI_MATCH_CACHE_TTL seconds.
+#A ranking request only sends the model the jobs missing from both tiers. Keys are content
+#fingerprints, so a profile or job edit needs no invalidation: old entries stop matching and expire.
+class RankingCache:
+    def __init__(self, config):
+        self.ttl = config['AI_MATCH_CACHE_TTL']
+        self._memory = LRUCache(config['AI_MATCH_CACHE_SIZE'], ttl=self.ttl)
+
+    #job id -> {"id", "match_score", "reason"} for every job in jobs that has a live score
+    def lookup(self, profile_fp, jobs):
+        found, missing = {}, {}
+        for job in jobs:
+            job_fp = job_fingerprint(job)
+            entry = self._memory.get((profile_fp, job["id"], job_fp))
+            if entry is not None:
+                found[job["id"]] = entry
+            else:
+                missing[job["id"]] = job_fp
+        if missing:
+            rows = JobMatchScore.query.filter(
+                JobMatchScore.profile_fp == profile_fp,
+                JobMatchScore.job_id.in_(list(missing)),
+                JobMatchScore.expires_at > datetime.utcnow()
+            ).all()
+            for row in rows:
+                if missing.get(row.job_id) != row.job_fp:
+                    continue
+                entry = {"id": row.job_id, "match_score": row.match_score, "reason": row.reason}
+                self._memory.set((profile_fp, row.job_id, row.job_fp), entry)
+                found[row.job_id] = entry
+        return found
+
+    def store(self, user_id, profile_fp, jobs, ranked):
+        jobs_by_id = {job["id"]: job for job in jobs}
+        now = datetime.utcnow()
+        rows = []
+        for entry in ranked:
+            try:
+                job = jobs_by_id.get(int(entry.get("id")))
+            except (TypeError, ValueError):
+                job = None
+            if job is None:
+                continue
+            entry = {"id": job["id"], "match_score": entry.get("match_score", 0), "reason": entry.get("reason")}
+            job_fp = job_fingerprint(job)
+            self._memory.set((profile_fp, job["id"], job_fp), entry)
+            rows.append(dict(profile_fp=profile_fp, job_id=job["id"], job_fp=job_fp, user_id=user_id,
+                             match_score=int(entry["match_score"] or 0), reason=entry["reason"],
+                             created_at=now, expires_at=now + timedelta(seconds=self.ttl)))
+        if not rows:
+            return
+        try:
+            # Replace any earlier score for the same versions, and drop expired rows while here
+            JobMatchScore.query.filter(
+                JobMatchScore.profile_fp == profile_fp,
+                JobMatchScore.job_id.in_([row["job_id"] for row in rows])
+            ).delete(synchronize_session=False)
+            JobMatchScore.query.filter(JobMatchScore.expires_at <= now).delete(synchronize_session=False)
+            db.session.execute(db.insert(JobMatchScore), rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            app.logger.exception("Failed to persist job match scores")
+
+
+ranking_cache = RankingCache(app.config)
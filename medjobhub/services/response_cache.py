@@ -0,0 +1,32 @@
+import hashlib
+from flask import request
+from medjobhub import app
+from .cache import LRUCache, Generation
+
+# Bumped by every route that changes the jobs table (add_job, delete_job, ...)
+jobs_generation = Generation()
+
+response_cache = LRUCache(app.config.get('RESPONSE_CACHE_SIZE', 256), ttl=app.config.get('RESPONSE_CACHE_TTL', 300))
+
+
+#Serves build() through the cache: keyed by path, query string and the jobs generation,
+#with a strong ETag so an unchanged response is answered with 304 and no body.
+#Only successful payloads are cached.
+def cached_json_response(build):
+    key = (request.path, tuple(sorted(request.args.items(multi=True))), jobs_generation.value)
+    entry = response_cache.get(key)
+    if entry is None:
+        payload = build()
+        body = app.json.dumps(payload).encode('utf-8')
+        entry = (body, hashlib.sha256(body).hexdigest())
+        if payload.get('success'):
+            response_cache.set(key, entry)
+
+    body, etag = entry
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,183 @@
+import secrets
+from abc import ABC, abstractmethod
+import threading
+import time
+from datetime import datetime, timedelta
+from flask.sessions import SessionInterface, SecureCookieSession, session_json_serializer
+from itsdangerous import Signer, BadSignature
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from medjobhub import app, db
+from medjobhub.models import ServerSession
+from .cache import LRUCache
+
+
+class SessionStore(ABC):
+    @abstractmethod
+    def get(self, sid):
+        pass
+
+    @abstractmethod
+    def set(self, sid, data, ttl):
+        pass
+
+    @abstractmethod
+    def delete(self, sid):
+        pass
+
+
+#Per-process store: bounded LRU, entries expire after the session lifetime
+class MemorySessionStore(SessionStore):
+    def __init__(self, maxsize):
+        self._cache = LRUCache(maxsize)
+
+    def get(self, sid):
+        return self._cache.get(sid)
+
+    def set(self, sid, data, ttl):
+        self._cache.set(sid, data, ttl=ttl)
+
+    def delete(self, sid):
+        self._cache.pop(sid)
+
+
+#Shared store in the server_sessions table; a daemon thread deletes expired rows
+#through the expires_at index so the table only holds live sessions
+class SqlSessionStore(SessionStore):
+    UPSERT_DIALECTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+    def __init__(self, engine, sweep_interval):
+        if engine.dialect.name not in self.UPSERT_DIALECTS:
+            raise ValueError(f"SqlSessionStore does not support {engine.dialect.name}")
+        self.engine = engine
+        self._insert = self.UPSERT_DIALECTS[engine.dialect.name]
+        self.sweep_interval = sweep_interval
+        self._sweeper = None
+
+    def get(self, sid):
+        with self.engine.connect() as conn:
+            data = conn.execute(
+                select(ServerSession.data).where(ServerSession.sid == sid, ServerSession.expires_at > datetime.utcnow())
+            ).scalar()
+        return data
+
+    def set(self, sid, data, ttl):
+        values = {"data": data, "expires_at": datetime.utcnow() + timedelta(seconds=ttl)}
+        #Single-statement upsert, so two requests saving a new session at once cannot both insert
+        statement = self._insert(ServerSession).values(sid=sid, **values)
+        with self.engine.begin() as conn:
+            conn.execute(statement.on_conflict_do_update(index_elements=[ServerSession.sid], set_=values))
+
+    def delete(self, sid):
+        with self.engine.begin() as conn:
+            conn.execute(delete(ServerSession).where(ServerSession.sid == sid))
+
+    def sweep(self):
+        with self.engine.begin() as conn:
+            return conn.execute(delete(ServerSession).where(ServerSession.expires_at <= datetime.utcnow())).rowcount
+
+    def start_sweeper(self):
+        if self._sweeper is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(self.sweep_interval)
+                try:
+                    self.sweep()
+                except Exception as e:
+                    app.logger.warning("Session sweep failed: %s", e)
+
+        self._sweeper = threading.Thread(target=run, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+
+class ServerSideSession(SecureCookieSession):
+    def __init__(self, initial=None, sid=None, new=False):
+        super().__init__(initial)
+        self.sid = sid
+        self.new = new
+
+
+#Flask session interface keeping only a (signed) session id in the cookie.
+#Unmodified sessions are not written back unless more than half their lifetime has passed.
+class ServerSideSessionInterface(SessionInterface):
+    serializer = session_json_serializer
+
+    def __init__(self, store, use_signer=True):
+        self.store = store
+        self.use_signer = use_signer
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='server-side-session', key_derivation='hmac')
+
+    def _sid_from_cookie(self, app, value):
+        if not self.use_signer:
+            return value
+        try:
+            return self._signer(app).unsign(value).decode()
+        except BadSignature:
+            return None
+
+    def _ttl(self, app):
+        return int(app.permanent_session_lifetime.total_seconds())
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        sid = self._sid_from_cookie(app, cookie) if cookie else None
+        if sid:
+            stored = self.store.get(sid)
+            if stored is not None:
+                data, written_at = self.serializer.loads(stored)
+                session = ServerSideSession(data, sid=sid)
+                session.written_at = written_at
+                return session
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        ttl = self._ttl(app)
+        now = time.time()
+        stale = now - getattr(session, 'written_at', now) > ttl / 2
+        if not (session.modified or stale):
+            return
+
+        self.store.set(session.sid, self.serializer.dumps([dict(session), now]), ttl)
+        value = self._signer(app).sign(session.sid).decode() if self.use_signer else session.sid
+        response.set_cookie(
+            name, value,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def init_session_store(app):
+    backend = app.config['SESSION_BACKEND']
+    if backend == 'filesystem':
+        from flask_session import Session
+        app.config['SESSION_TYPE'] = 'filesystem'
+        Session(app)
+        return
+
+    if backend == 'memory':
+        store = MemorySessionStore(app.config['SESSION_MEMORY_MAXSIZE'])
+    elif backend == 'sql':
+        with app.app_context():
+            store = SqlSessionStore(db.engine, app.config['SESSION_SWEEP_INTERVAL'])
+        store.start_sweeper()
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
+    app.session_interface = ServerSideSessionInterface(store, use_signer=app.config.get('SESSION_USE_SIGNER', True))
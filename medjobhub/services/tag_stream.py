@@ -0,0 +1,122 @@
+# Incremental parser for the chatbot's streamed reply format:
+#   <PARA>paragraph</PARA> ... <PARA>paragraph</PARA><JSON>{...}</JSON>
+# Each chunk is scanned once; only a tail shorter than the longest tag is carried over
+# to the next chunk, so total work is linear in the reply length and tags may be split
+# across chunks anywhere.
+
+PARA_OPEN, PARA_CLOSE = "<PARA>", "</PARA>"
+JSON_OPEN, JSON_CLOSE = "<JSON>", "</JSON>"
+
+OUTSIDE, IN_PARA, IN_JSON, DONE = "outside", "para", "json", "done"
+
+# Event kinds returned by feed()/close()
+DELTA = "delta"  # newly streamed text of the open paragraph (only with partial=True)
+PARA = "para"    # a complete paragraph, stripped
+JSON = "json"    # the final JSON block, stripped; nothing is parsed after it
+
+
+# A tag split across chunks leaves at most this many of its characters at the chunk end
+MAX_PENDING = max(map(len, (PARA_OPEN, PARA_CLOSE, JSON_OPEN, JSON_CLOSE))) - 1
+
+
+#Length of the longest suffix of text that is a proper prefix of one of the tags (all tags
+#start with "<", so only suffixes starting at a "<" near the end need checking)
+def pending_tag_length(text, tags):
+    start = text.find("<", max(0, len(text) - MAX_PENDING))
+    while start != -1:
+        tail = text[start:]
+        for tag in tags:
+            if tag.startswith(tail):
+                return len(text) - start
+        start = text.find("<", start + 1)
+    return 0
+
+
+class TagStreamParser:
+    def __init__(self, partial=False):
+        self.partial = partial
+        self.state = OUTSIDE
+        self._carry = ""
+        self._parts = []
+        self._outside = []
+        self._sync()
+
+    #Where a chunk without "<" goes as-is: no tag can start or end in it, so it needs no
+    #scanning. None while part of a tag is carried over or after the JSON block.
+    def _sync(self):
+        if self._carry or self.state == DONE:
+            self._sink = None
+        else:
+            self._sink = self._outside if self.state == OUTSIDE else self._parts
+        self._deltas = self.partial and self.state == IN_PARA
+
+    def feed(self, chunk):
+        if self._sink is not None and "<" not in chunk:
+            self._sink.append(chunk)
+            return [(DELTA, chunk)] if self._deltas and chunk else []
+        events = self._scan(chunk)
+        self._sync()
+        return events
+
+    def _scan(self, chunk):
+        events = []
+        if self.state == DONE or not chunk:
+            return events
+        text = self._carry + chunk
+        self._carry = ""
+        position = 0
+        while position < len(text) and self.state != DONE:
+            if self.state == OUTSIDE:
+                para_at = text.find(PARA_OPEN, position)
+                json_at = text.find(JSON_OPEN, position)
+                found = [at for at in (para_at, json_at) if at != -1]
+                if not found:
+                    keep = pending_tag_length(text[position:], (PARA_OPEN, JSON_OPEN))
+                    self._outside.append(text[position:len(text) - keep])
+                    self._carry = text[len(text) - keep:]
+                    break
+                # Stray text before a block is dropped, as the old buffer loop did
+                at = min(found)
+                self._outside = []
+                if at == para_at:
+                    self.state, position = IN_PARA, at + len(PARA_OPEN)
+                else:
+                    self.state, position = IN_JSON, at + len(JSON_OPEN)
+            else:
+                closing = PARA_CLOSE if self.state == IN_PARA else JSON_CLOSE
+                at = text.find(closing, position)
+                if at == -1:
+                    keep = pending_tag_length(text[position:], (closing,))
+                    segment = text[position:len(text) - keep]
+                    self._append(segment, events)
+                    self._carry = text[len(text) - keep:]
+                    break
+                self._append(text[position:at], events)
+                body = "".join(self._parts).strip()
+                self._parts = []
+                if self.state == IN_PARA:
+                    events.append((PARA, body))
+                    self.state = OUTSIDE
+                else:
+                    events.append((JSON, body))
+                    self.state = DONE
+                position = at + len(closing)
+        return events
+
+    def _append(self, segment, events):
+        if not segment:
+            return
+        self._parts.append(segment)
+        if self.partial and self.state == IN_PARA:
+            events.append((DELTA, segment))
+
+    #End of stream. Like the old buffer loop, anything left without a final JSON block
+    #(stray text, an unclosed paragraph or JSON) comes back as one last paragraph.
+    def close(self):
+        if self.state == DONE:
+            return []
+        leftover = ("".join(self._outside) + "".join(self._parts) + self._carry).strip()
+        self.state = DONE
+        self._carry, self._parts, self._outside = "", [], []
+        self._sync()
+        return [(PARA, leftover)] if leftover else []
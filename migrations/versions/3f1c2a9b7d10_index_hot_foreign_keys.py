@@ -0,0 +1,48 @@
+"""index hot foreign keys, job filter columns and user_profiles.user_id
+
+Revision ID: 3f1c2a9b7d10
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9b7d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns); users.auth_token is left out because its UNIQUE
+# constraint already gives it an index.
+INDEXES = [
+    ('ix_jobs_posted_by', 'jobs', ['posted_by']),
+    ('ix_jobs_location_id', 'jobs', ['location', 'id']),
+    ('ix_jobs_specialization_id', 'jobs', ['specialization', 'id']),
+    ('ix_jobs_employment_type_id', 'jobs', ['employment_type', 'id']),
+    ('ix_jobs_job_type_id', 'jobs', ['job_type', 'id']),
+    ('ix_jobs_salary_id', 'jobs', ['salary', 'id']),
+    ('ix_job_applications_job_id', 'job_applications', ['job_id']),
+    ('ix_job_applications_user_id', 'job_applications', ['user_id']),
+    ('ix_job_applications_application_status', 'job_applications', ['application_status']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+    # Keep the oldest profile of each user so user_id can become unique
+    op.execute(
+        "DELETE FROM user_profiles WHERE id NOT IN "
+        "(SELECT min(id) FROM user_profiles GROUP BY user_id)"
+    )
+    op.create_index('ix_user_profiles_user_id', 'user_profiles', ['user_id'], unique=True, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_user_profiles_user_id', table_name='user_profiles', if_exists=True)
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,33 @@
+"""server_sessions table for the SQL session store
+
+Revision ID: 8b2d4e6f1a03
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2d4e6f1a03'
+down_revision = '3f1c2a9b7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'server_sessions',
+        sa.Column('sid', sa.String(length=64), nullable=False),
+        sa.Column('data', sa.Text(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('sid'),
+        if_not_exists=True
+    )
+    op.create_index('ix_server_sessions_expires_at', 'server_sessions', ['expires_at'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_server_sessions_expires_at', table_name='server_sessions', if_exists=True)
+    op.drop_table('server_sessions', if_exists=True)
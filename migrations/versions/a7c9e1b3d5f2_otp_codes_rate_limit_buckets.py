@@ -0,0 +1,44 @@
+"""otp_codes and rate_limit_buckets tables shared by all workers
+
+Revision ID: a7c9e1b3d5f2
+Revises: f3a5c7e9b1d4
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c9e1b3d5f2'
+down_revision = 'f3a5c7e9b1d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'otp_codes',
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('code', sa.String(length=6), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('username'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'rate_limit_buckets',
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+        if_not_exists=True
+    )
+    op.create_index('ix_rate_limit_buckets_updated_at', 'rate_limit_buckets', ['updated_at'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_rate_limit_buckets_updated_at', table_name='rate_limit_buckets', if_exists=True)
+    op.drop_table('rate_limit_buckets', if_exists=True)
+    op.drop_table('otp_codes', if_exists=True)
@@ -0,0 +1,44 @@
+"""job_match_scores table for cached /ai-job-matcher scores
+
+Revision ID: d7f9b1c3e5a8
+Revises: c5e7a9d2b4f6
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f9b1c3e5a8'
+down_revision = 'c5e7a9d2b4f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'job_match_scores',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('profile_fp', sa.String(length=64), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('job_fp', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('match_score', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_job_match_scores_profile_job', 'job_match_scores', ['profile_fp', 'job_id', 'job_fp'], unique=True, if_not_exists=True)
+    op.create_index('ix_job_match_scores_user_id', 'job_match_scores', ['user_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_job_match_scores_expires_at', 'job_match_scores', ['expires_at'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_job_match_scores_expires_at', table_name='job_match_scores', if_exists=True)
+    op.drop_index('ix_job_match_scores_user_id', table_name='job_match_scores', if_exists=True)
+    op.drop_index('ix_job_match_scores_profile_job', table_name='job_match_scores', if_exists=True)
+    op.drop_table('job_match_scores', if_exists=True)
@@ -0,0 +1,23 @@
+"""index chat_message on (room, timestamp) for room history paging
+
+Revision ID: e9b1d3f5a7c2
+Revises: d7f9b1c3e5a8
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9b1d3f5a7c2'
+down_revision = 'd7f9b1c3e5a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_chat_message_room_timestamp', 'chat_message', ['room', 'timestamp'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_chat_message_room_timestamp', table_name='chat_message', if_exists=True)
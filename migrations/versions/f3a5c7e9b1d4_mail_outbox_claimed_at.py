@@ -0,0 +1,33 @@
+"""claimed_at lease on mail_outbox claims
+
+Revision ID: f3a5c7e9b1d4
+Revises: e9b1d3f5a7c2
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a5c7e9b1d4'
+down_revision = 'e9b1d3f5a7c2'
+branch_labels = None
+depends_on = None
+
+
+def _has_claimed_at():
+    return 'claimed_at' in [column['name'] for column in sa.inspect(op.get_bind()).get_columns('mail_outbox')]
+
+
+def upgrade():
+    # app.py runs create_all() before upgrade(), which may already have added the column
+    if not _has_claimed_at():
+        with op.batch_alter_table('mail_outbox') as batch_op:
+            batch_op.add_column(sa.Column('claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    if _has_claimed_at():
+        with op.batch_alter_table('mail_outbox') as batch_op:
+            batch_op.drop_column('claimed_at')
@@ -0,0 +1,89 @@
+"""Concurrent read/write benchmark for the SQLite engine settings.
+
+Runs reader and writer threads against two scratch databases, one with the
+driver defaults and one with the pragmas from medjobhub.set_sqlite_pragmas,
+and reports throughput and "database is locked" failures for each:
+
+    python scripts/bench_db_concurrency.py --readers 8 --writers 4 --seconds 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from medjobhub import set_sqlite_pragmas
+
+
+def make_engine(path, tuned):
+    # Short driver timeout so lock contention shows up as errors instead of long stalls
+    engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 0.1}, pool_size=32, max_overflow=0)
+    if tuned:
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, title TEXT, salary REAL)"))
+        conn.execute(text("INSERT INTO jobs (title, salary) VALUES (:t, :s)"),
+                     [{"t": f"Job {i}", "s": i} for i in range(5000)])
+    return engine
+
+
+def run(engine, readers, writers, seconds):
+    stats = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def record(key):
+        with lock:
+            stats[key] += 1
+
+    def reader():
+        while time.monotonic() < stop:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT count(*), avg(salary) FROM jobs WHERE salary > 100")).all()
+                record("reads")
+            except OperationalError:
+                record("errors")
+
+    def writer():
+        while time.monotonic() < stop:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO jobs (title, salary) VALUES ('new', 1)"))
+                    conn.execute(text("UPDATE jobs SET salary = salary + 1 WHERE id = abs(random()) % 5000"))
+                record("writes")
+            except OperationalError:
+                record("errors")
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, tuned in (("default", False), ("tuned (WAL)", True)):
+            engine = make_engine(os.path.join(tmp, f"{tuned}.db"), tuned)
+            stats = run(engine, args.readers, args.writers, args.seconds)
+            print(f"{label:12} reads/s={stats['reads'] / args.seconds:9.0f} "
+                  f"writes/s={stats['writes'] / args.seconds:7.0f} locked={stats['errors']}")
+
+
+if __name__ == "__main__":
+    main()
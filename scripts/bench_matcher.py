@@ -0,0 +1,64 @@
+"""Wall-clock cost of model ranking, one big call vs parallel shards.
+
+Uses a fake model client whose latency grows with the number of jobs in the
+prompt (like output tokens do), so no API key or network is needed:
+
+    python scripts/bench_matcher.py --jobs 60 --per-job-ms 40 --deadline 3
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from medjobhub.services.llm_ranker import ShardedRanker
+
+
+class FakeClient:
+    def __init__(self, base_ms, per_job_ms, jitter):
+        self.base_ms = base_ms
+        self.per_job_ms = per_job_ms
+        self.jitter = jitter
+
+    def generate(self, prompt):
+        jobs = json.loads(prompt)
+        delay = (self.base_ms + self.per_job_ms * len(jobs)) / 1000.0
+        time.sleep(delay * random.uniform(1, 1 + self.jitter))
+        return json.dumps({"ranked_jobs": [
+            {"id": job["id"], "match_score": random.randint(0, 100), "reason": "fake"} for job in jobs
+        ]})
+
+
+def build_prompt(jobs):
+    return json.dumps(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=60)
+    parser.add_argument("--base-ms", type=float, default=400)
+    parser.add_argument("--per-job-ms", type=float, default=40)
+    parser.add_argument("--jitter", type=float, default=0.5, help="max extra latency as a fraction")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--deadline", type=float, default=60)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+    client = FakeClient(args.base_ms, args.per_job_ms, args.jitter)
+    jobs = [{"id": i, "title": f"Job {i}"} for i in range(args.jobs)]
+    print(f"{'shard size':>10} {'seconds':>8} {'scored':>7} {'partial':>8}")
+    for shard_size in (args.jobs, 20, 10, 5):
+        ranker = ShardedRanker(client, shard_size, args.workers, args.deadline)
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            scored, _, partial = ranker.rank(build_prompt, jobs)
+            elapsed = time.perf_counter() - start
+            print(f"{shard_size:>10} {elapsed:>8.2f} {len(scored):>7} {str(partial):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Per-request session overhead for each session backend.
+
+Issues GET /get_session with a signed-in session through the Flask test
+client and reports the mean time per request for the Flask-Session
+filesystem store and the memory/sql stores in medjobhub.services.session_store
+(the sql store runs against a scratch SQLite database):
+
+    python scripts/bench_sessions.py --requests 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_session import Session
+from sqlalchemy import create_engine
+from medjobhub import app
+from medjobhub.models import ServerSession
+from medjobhub.services.session_store import (
+    MemorySessionStore, ServerSideSessionInterface, SqlSessionStore,
+)
+
+
+def filesystem_interface(directory):
+    app.config.update(SESSION_TYPE='filesystem', SESSION_FILE_DIR=directory)
+    Session(app)
+    return app.session_interface
+
+
+def measure(interface, requests):
+    app.session_interface = interface
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+        session['role'] = 'job_seeker'
+    client.get('/get_session')
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get('/get_session')
+    read = (time.perf_counter() - start) / requests
+
+    start = time.perf_counter()
+    for i in range(requests):
+        with client.session_transaction() as session:
+            session['counter'] = i
+    write = (time.perf_counter() - start) / requests
+    return read, write
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    app.config['TESTING'] = True
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'sessions.db')}")
+        ServerSession.__table__.create(engine)
+        interfaces = {
+            "filesystem": filesystem_interface(os.path.join(directory, "flask_session")),
+            "memory": ServerSideSessionInterface(MemorySessionStore(10000)),
+            "sql": ServerSideSessionInterface(SqlSessionStore(engine, sweep_interval=300)),
+        }
+        for name, interface in interfaces.items():
+            read, write = measure(interface, args.requests)
+            print(f"{name:10} read request {read * 1e6:8.1f} us   session write {write * 1e6:8.1f} us")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Sign-in throughput under concurrent load, inline hashing vs the process pool.
+
+Signs a verified user in from many threads through the Flask test client while
+one more thread times a cheap request (/get_session), so the numbers show both
+login throughput and how much hashing stalls unrelated requests. The app runs
+against a scratch SQLite database, so the bench account never reaches a real one:
+
+    python scripts/bench_signin.py --threads 16 --seconds 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_signin.db')}"
+
+from medjobhub import app, db
+from medjobhub.models import User
+from medjobhub.services.passwords import PasswordHasher
+import medjobhub.routes.signin as signin_routes
+
+USERNAME, PASSWORD = "bench_signin_user", "bench-password"
+
+
+def ensure_user(hasher):
+    with app.app_context():
+        db.create_all()
+        user = User.query.filter_by(username=USERNAME).first()
+        if not user:
+            user = User(username=USERNAME, first_name="Bench", last_name="User", email="bench@example.com",
+                        password="", role="job_seeker", is_verified=True)
+            db.session.add(user)
+        user.password = hasher.hash(PASSWORD)
+        user.is_verified = True
+        db.session.commit()
+
+
+def run(threads, seconds):
+    stop = time.monotonic() + seconds
+    logins = []
+    probe_latencies = []
+
+    def login_loop():
+        client = app.test_client()
+        count = 0
+        while time.monotonic() < stop:
+            response = client.post("/signin", json={"username": USERNAME, "password": PASSWORD})
+            count += response.status_code == 200 and response.json.get("success", False)
+        logins.append(count)
+
+    def probe_loop():
+        client = app.test_client()
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            client.get("/get_session")
+            probe_latencies.append(time.perf_counter() - start)
+            time.sleep(0.01)
+
+    workers = [threading.Thread(target=login_loop) for _ in range(threads)] + [threading.Thread(target=probe_loop)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(logins) / seconds, statistics.median(probe_latencies), max(probe_latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    app.config["TESTING"] = True
+
+    for label, workers in (("inline", 0), ("pool", app.config["PASSWORD_HASH_WORKERS"])):
+        hasher = PasswordHasher({**app.config, "PASSWORD_HASH_WORKERS": workers})
+        signin_routes.password_hasher = hasher
+        ensure_user(hasher)
+        rate, p50, worst = run(args.threads, args.seconds)
+        print(f"{label:7} workers={workers:2}  sign-ins/s={rate:7.1f}  "
+              f"/get_session p50={p50 * 1000:7.1f} ms  max={worst * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
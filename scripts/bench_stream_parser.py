@@ -0,0 +1,95 @@
+"""Chatbot stream parsing cost, old buffer loop vs the incremental tag parser.
+
+Builds a synthetic <PARA>...</PARA><JSON>...</JSON> reply, cuts it into small
+random chunks as a streamed model reply arrives, and times both parsers:
+
+    python scripts/bench_stream_parser.py --sizes 10000 100000 1000000 --chunk 12
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from medjobhub.services.tag_stream import TagStreamParser
+
+WORDS = "patient ward shift nurse ICU care cardiology salary hospital experience license".split()
+
+
+def make_reply(size, paragraph_words):
+    paragraphs, total = [], 0
+    while total < size:
+        paragraph = " ".join(random.choice(WORDS) for _ in range(paragraph_words))
+        paragraphs.append(f"<PARA>{paragraph}</PARA>\n")
+        total += len(paragraphs[-1])
+    return "".join(paragraphs) + '<JSON>{"reply": "done", "action": null}</JSON>'
+
+
+def chunked(text, mean):
+    chunks, position = [], 0
+    while position < len(text):
+        step = random.randint(1, 2 * mean)
+        chunks.append(text[position:position + step])
+        position += step
+    return chunks
+
+
+#The loop chatbot_stream used before: append, then rescan the whole buffer per chunk
+def legacy_parse(chunks):
+    events, buffer = [], ""
+    for text in chunks:
+        buffer += text
+        while "<PARA>" in buffer and "</PARA>" in buffer:
+            start = buffer.index("<PARA>") + len("<PARA>")
+            end = buffer.index("</PARA>")
+            events.append(buffer[start:end].strip())
+            buffer = buffer[end + len("</PARA>"):]
+        if "<JSON>" in buffer and "</JSON>" in buffer:
+            start = buffer.index("<JSON>") + len("<JSON>")
+            events.append(buffer[start:buffer.index("</JSON>")].strip())
+            return events
+    return events
+
+
+def parser_parse(chunks, partial=False):
+    parser, events = TagStreamParser(partial=partial), []
+    feed = parser.feed
+    for text in chunks:
+        for kind, body in feed(text):
+            if kind != "delta":
+                events.append(body)
+    events.extend(body for _, body in parser.close())
+    return events
+
+
+def timed(parse, chunks):
+    start = time.perf_counter()
+    result = parse(chunks)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--chunk", type=int, default=12, help="mean chunk length in characters")
+    parser.add_argument("--paragraph-words", type=int, nargs="+", default=[60, 2000],
+                        help="paragraph lengths to try; the old loop degrades as paragraphs grow")
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{'words/para':>10} {'chars':>9} {'chunks':>8} {'legacy ms':>10} {'parser ms':>10} {'+deltas ms':>11}")
+    for words in args.paragraph_words:
+        for size in args.sizes:
+            chunks = chunked(make_reply(size, words), args.chunk)
+            legacy_time, legacy_events = timed(legacy_parse, chunks)
+            parser_time, parser_events = timed(parser_parse, chunks)
+            delta_time, _ = timed(lambda c: parser_parse(c, partial=True), chunks)
+            assert legacy_events == parser_events, "parsers disagree"
+            print(f"{words:>10} {size:>9} {len(chunks):>8} {legacy_time * 1000:>10.1f} "
+                  f"{parser_time * 1000:>10.1f} {delta_time * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""End-to-end check of the mail outbox against a local SMTP server.
+
+Starts an SMTP sink on localhost (aiosmtpd when installed, else the stdlib
+smtpd module), points two MailOutbox instances, which stand in for two app
+processes, at one scratch SQLite database and enqueues messages through both.
+The database also gets a "sending" row whose claim has expired (its worker
+died) and one still held by a live worker. Every message must arrive exactly
+once, and the live claim must not be stolen:
+
+    python scripts/check_mail_outbox.py --messages 200
+"""
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from email import message_from_bytes
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+#Returns (stop, received); received collects the Subject of every delivered message
+def start_smtp_sink(port):
+    received = []
+    lock = threading.Lock()
+
+    def record(data):
+        if isinstance(data, str):
+            data = data.encode()
+        with lock:
+            received.append(message_from_bytes(data)["Subject"])
+
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        import asyncore
+        import smtpd
+
+        class Sink(smtpd.SMTPServer):
+            def process_message(self, peer, mailfrom, rcpttos, data, **kwargs):
+                record(data)
+
+        server = Sink(("127.0.0.1", port), None, decode_data=False)
+        thread = threading.Thread(target=asyncore.loop, kwargs={"timeout": 0.1}, daemon=True)
+        thread.start()
+        return server.close, received
+
+    class Handler:
+        async def handle_DATA(self, server, session, envelope):
+            record(envelope.content)
+            return "250 OK"
+
+    controller = Controller(Handler(), hostname="127.0.0.1", port=port)
+    controller.start()
+    return controller.stop, received
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    port = free_port()
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{os.path.join(directory, 'outbox.db')}",
+        MAIL_SERVER="127.0.0.1", MAIL_PORT=str(port), MAIL_USE_SSL="false", MAIL_USE_TLS="false",
+        MAIL_OUTBOX_POLL_INTERVAL="1", MAIL_OUTBOX_BATCH_SIZE="10",
+    )
+    os.environ.pop("EMAIL_ID", None)
+
+    from flask_mail import Message
+    from sqlalchemy import insert, select
+    from medjobhub import app, db
+    from medjobhub.models import OutboxMessage
+    from medjobhub.services.mail_outbox import MailOutbox
+
+    stop, received = start_smtp_sink(port)
+    with app.app_context():
+        db.create_all()
+        now = datetime.utcnow()
+        claimed = {"sender": "bench@localhost", "recipients": '["to@localhost"]', "body": "claimed",
+                   "status": "sending", "attempts": 0, "next_attempt_at": now, "created_at": now}
+        with db.engine.begin() as conn:
+            conn.execute(insert(OutboxMessage).values(**{**claimed, "subject": "stale-claim",
+                                                         "claimed_at": now - timedelta(hours=1)}))
+            conn.execute(insert(OutboxMessage).values(**{**claimed, "subject": "live-claim", "claimed_at": now}))
+
+    outboxes = [MailOutbox(app.config), MailOutbox(app.config)]
+    start = time.perf_counter()
+    for i in range(args.messages):
+        outboxes[i % 2].enqueue(Message(f"message-{i}", sender="bench@localhost", recipients=["to@localhost"],
+                                        body="outbox check"))
+
+    expected = {f"message-{i}" for i in range(args.messages)} | {"stale-claim"}
+    deadline = time.monotonic() + args.timeout
+    while not expected <= set(received) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    elapsed = time.perf_counter() - start
+    time.sleep(2)  # let a duplicate delivery, if any, show up
+    stop()
+
+    with app.app_context(), db.engine.connect() as conn:
+        statuses = dict(conn.execute(select(OutboxMessage.subject, OutboxMessage.status)).all())
+
+    missing = expected - set(received)
+    duplicates = sorted({subject for subject in received if received.count(subject) > 1})
+    print(f"delivered {len(received)} messages in {elapsed:.2f}s")
+    print(f"missing {len(missing)}, duplicated {len(duplicates)}, live claim stolen: {'live-claim' in received}")
+    print(f"outbox status of the live claim: {statuses.get('live-claim')}")
+    ok = not missing and not duplicates and "live-claim" not in received
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Print EXPLAIN QUERY PLAN for the queries issued by the routes.
+
+Run from the repository root against the configured (SQLite) database:
+
+    python scripts/explain_queries.py
+
+Any step that scans a whole table instead of searching an index is flagged
+with "FULL SCAN" and makes the script exit with status 1. Steps that sort the
+matching rows in a temporary b-tree because no index gives the requested order
+are flagged with "TEMP SORT"; they are reported but do not fail the run.
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+from medjobhub import app, db
+from medjobhub.models import User, Job, JobApplication, UserProfile
+
+
+def route_queries():
+    employer_apps = db.session.query(JobApplication).join(Job, JobApplication.job_id == Job.id).filter(Job.posted_by == 1)
+    return {
+        "signin: user by username": User.query.filter_by(username="someone"),
+        "verify-token: user by auth_token": User.query.filter_by(auth_token="0" * 32),
+        "profile: profile by user_id": UserProfile.query.filter_by(user_id=1),
+        "available_jobs: first page": Job.query.options(*Job.to_dict_options()).order_by(Job.id.desc()).limit(51),
+        "available_jobs: next page by location": Job.query.options(*Job.to_dict_options()).filter(
+            Job.location == "Mumbai", Job.id < 1000).order_by(Job.id.desc()).limit(51),
+        "available_jobs: by specialization": Job.query.filter(Job.specialization == "Nursing").order_by(Job.id.desc()).limit(51),
+        "available_jobs: by employment_type": Job.query.filter(Job.employment_type == "Full-time").order_by(Job.id.desc()).limit(51),
+        "available_jobs: by job_type": Job.query.filter(Job.job_type == "Hospital").order_by(Job.id.desc()).limit(51),
+        "available_jobs: salary range": Job.query.filter(Job.salary >= 1000, Job.salary <= 5000).order_by(Job.id.desc()).limit(51),
+        "your_jobs: jobs by employer": Job.query.options(*Job.to_dict_options()).filter_by(posted_by=1),
+        "job_details: job by id": Job.query.filter(Job.id == 1),
+        "delete_job: applications of a job": JobApplication.query.filter_by(job_id=1),
+        "employer_applications": JobApplication.query.join(Job).filter(Job.posted_by == 1).options(*JobApplication.to_dict_options()),
+        "jobseeker_applications": JobApplication.query.options(*JobApplication.to_dict_options()).filter_by(user_id=1),
+        "employer_stats: per job and status": db.session.query(
+            Job.id, JobApplication.application_status, func.count(JobApplication.id)
+        ).outerjoin(JobApplication, JobApplication.job_id == Job.id).filter(Job.posted_by == 1).group_by(
+            Job.id, JobApplication.application_status),
+        "employer_stats: per day": employer_apps.with_entities(
+            func.date(JobApplication.applied_on), func.count(JobApplication.id)
+        ).filter(JobApplication.applied_on >= datetime.utcnow() - timedelta(days=30)).group_by(func.date(JobApplication.applied_on)),
+        "export_applications": select(JobApplication.id, Job.title).join(Job, JobApplication.job_id == Job.id).where(
+            Job.posted_by == 1).order_by(JobApplication.id),
+    }
+
+
+# Unfiltered pages walk the rowid b-tree newest-first and stop after LIMIT rows,
+# so their "SCAN jobs" is bounded by the page size.
+BOUNDED_SCANS = {"available_jobs: first page"}
+
+
+def explain(connection, statement):
+    statement = getattr(statement, "statement", statement)
+    compiled = statement.compile(dialect=connection.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    return connection.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params).all()
+
+
+def is_full_scan(detail):
+    # "SCAN jobs" reads the whole table; "SCAN jobs USING INDEX ..." walks an index in order
+    return detail.startswith("SCAN ") and "USING" not in detail
+
+
+def is_temp_sort(detail):
+    # "USE TEMP B-TREE FOR ORDER BY" / "... FOR GROUP BY": every matching row is read and sorted
+    return detail.startswith("USE TEMP B-TREE")
+
+
+def main():
+    full_scans = temp_sorts = 0
+    with app.app_context():
+        if db.engine.dialect.name != "sqlite":
+            print("EXPLAIN QUERY PLAN is SQLite syntax; point SQLALCHEMY_DATABASE_URI at a SQLite database.")
+            return 2
+        with db.engine.connect() as connection:
+            for name, statement in route_queries().items():
+                print(f"== {name}")
+                for row in explain(connection, statement):
+                    detail = row[-1]
+                    flag = ""
+                    if is_full_scan(detail) and name not in BOUNDED_SCANS:
+                        flag = "FULL SCAN  "
+                        full_scans += 1
+                    elif is_temp_sort(detail):
+                        flag = "TEMP SORT  "
+                        temp_sorts += 1
+                    print(f"   {flag}{detail}")
+    print(f"\n{full_scans} full table scan(s), {temp_sorts} temp b-tree sort(s)")
+    return 1 if full_scans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import importlib.util
+import os
+
+import pytest
+
+# tag_stream has no dependencies; load it by path so the tests do not need the Flask app
+# (and its database, mail and API settings) that importing medjobhub sets up
+_spec = importlib.util.spec_from_file_location(
+    "tag_stream",
+    os.path.join(os.path.dirname(__file__), os.pardir, "medjobhub", "services", "tag_stream.py"),
+)
+tag_stream = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tag_stream)
+
+TagStreamParser, DELTA, PARA, JSON = tag_stream.TagStreamParser, tag_stream.DELTA, tag_stream.PARA, tag_stream.JSON
+
+REPLY = (
+    "<PARA>ICU nurses are in demand in Mumbai.</PARA>\n"
+    "<PARA>Check salary < 50000 and shift <timing> before applying.</PARA>\n"
+    '<JSON>{"reply": "2 jobs", "action": null}</JSON>'
+)
+EXPECTED = [
+    (PARA, "ICU nurses are in demand in Mumbai."),
+    (PARA, "Check salary < 50000 and shift <timing> before applying."),
+    (JSON, '{"reply": "2 jobs", "action": null}'),
+]
+
+
+def parse(chunks, partial=False):
+    parser, events = TagStreamParser(partial=partial), []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    events.extend(parser.close())
+    return events
+
+
+def test_whole_reply():
+    assert parse([REPLY]) == EXPECTED
+
+
+@pytest.mark.parametrize("offset", range(1, len(REPLY)))
+def test_split_at_every_offset(offset):
+    assert parse([REPLY[:offset], REPLY[offset:]]) == EXPECTED
+
+
+def test_one_character_chunks():
+    assert parse(list(REPLY)) == EXPECTED
+
+
+def test_less_than_sign_inside_paragraph():
+    text = "<PARA>a < b, x<y and <PAR is not a tag; neither is </PAR or <JSON</PARA>"
+    expected = [(PARA, "a < b, x<y and <PAR is not a tag; neither is </PAR or <JSON")]
+    assert parse([text]) == expected
+    assert parse(list(text)) == expected
+
+
+def test_partial_deltas_add_up_to_the_paragraph():
+    events = parse(list(REPLY), partial=True)
+    assert [event for event in events if event[0] != DELTA] == EXPECTED
+
+    first_para = events.index(EXPECTED[0])
+    deltas = "".join(body for kind, body in events[:first_para] if kind == DELTA)
+    assert deltas.strip() == EXPECTED[0][1]
+    assert all(kind != DELTA for kind, _ in events[events.index(EXPECTED[1]):])
+
+
+def test_no_deltas_by_default():
+    assert all(kind != DELTA for kind, _ in parse(list(REPLY)))
+
+
+def test_stray_text_before_a_block_is_dropped():
+    assert parse(["Sure! ", "<PARA>Hello</PARA>"]) == [(PARA, "Hello")]
+
+
+@pytest.mark.parametrize("chunks, leftover", [
+    (["<PARA>unfinished para"], "unfinished para"),
+    (["<PARA>done</PARA>", '<JSON>{"reply": '], '{"reply":'),
+    (["<PARA>done</PARA>", "trailing text"], "trailing text"),
+    (["<PARA>cut off at </PA"], "cut off at </PA"),
+])
+def test_close_returns_unclosed_text_as_a_paragraph(chunks, leftover):
+    parser = TagStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    assert parser.close() == [(PARA, leftover)]
+    assert parser.close() == []
+
+
+def test_close_with_nothing_left():
+    parser = TagStreamParser()
+    parser.feed("<PARA>done</PARA>  ")
+    assert parser.close() == []
+
+
+def test_nothing_is_emitted_after_json():
+    parser = TagStreamParser(partial=True)
+    events = parser.feed('<JSON>{"a": 1}</JSON><PARA>late</PARA>')
+    assert events == [(JSON, '{"a": 1}')]
+    assert parser.feed("<PARA>later</PARA>") == []
+    assert parser.feed("more text") == []
+    assert parser.close() == []